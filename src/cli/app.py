@@ -7,10 +7,12 @@ Refactored CLI interface with improved error handling and structure.
 import sys
 import click
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Dict, Any, List
+import queue
 import re
+import threading
 
-from colorama import init, Fore, Style
+from colorama import init
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
@@ -19,24 +21,36 @@ from ..core.exceptions import (
     FlowStateError, InvalidURLError, VideoDownloadError,
     PoseDetectionError, GitHubAuthError
 )
-from ..core.downloader import YouTubeDownloader
-from ..core.analyzer import PoseAnalyzer
-from ..core.publisher import GitHubPublisher
 from ..viewer.builder import ViewerBuilder
 from ..utils.validators import validate_youtube_url, validate_github_token
 from ..core.server import FlowStateServer
 
-# Initialize colorama for cross-platform color support
-init(autoreset=True)
-console = Console()
+# Initialize colorama for cross-platform color support; only needed for an interactive terminal
+_IS_TTY = sys.stdout.isatty()
+if _IS_TTY:
+    init(autoreset=True)
+
+# Decide terminal support once; otherwise let rich honour FORCE_COLOR and friends
+console = Console(force_terminal=_IS_TTY or None, highlight=False)
+
+# Characters not allowed in generated repository names
+_REPO_SANITIZE = re.compile(r'[^a-zA-Z0-9-]')
 
 
 class FlowStateCLI:
     """Main CLI application class."""
 
     def __init__(self):
+        # The pipeline modules pull in torch, ultralytics, OpenCV, yt-dlp and PyGithub;
+        # importing them here keeps --help, --version and argument errors fast
+        from ..core.downloader import YouTubeDownloader
+        from ..core.analyzer import PoseAnalyzer
+        from ..core.cache import AnalysisCache
+        from ..core.publisher import GitHubPublisher
+
         self.downloader = YouTubeDownloader()
         self.analyzer = PoseAnalyzer()
+        self.analysis_cache = AnalysisCache()
         self.viewer_builder = ViewerBuilder()
         self.publisher = GitHubPublisher()
 
@@ -46,12 +60,69 @@ class FlowStateCLI:
         console.print("[cyan]      FlowState-CLI: Tai Chi Analysis & Publishing[/cyan]")
         console.print("[cyan]" + "="*60 + "[/cyan]\n")
 
-    def run_analysis(self, youtube_url: str) -> Tuple[Optional[Path], Optional[dict]]:
+    def extract_and_analyze(self, video_path: Path) -> Dict[str, Any]:
+        """
+        Extract frames and analyze them concurrently.
+        Decoding runs in a background thread and hands frames to the analyzer in
+        memory through a bounded queue, so decoding overlaps with pose inference.
+        The decoder is stopped and joined before this returns or raises.
+
+        Args:
+            video_path: Path to the video file
+
+        Returns:
+            Pose analysis results
+        """
+        # Keypoints are mapped back to the source resolution, whatever size frames are analyzed at
+        source_size = self.downloader.frame_size(video_path)
+
+        # Bound the decoded frames held in memory to a couple of inference batches
+        frame_queue: queue.Queue = queue.Queue(maxsize=2 * max(1, settings.batch_size))
+        extraction_errors: List[BaseException] = []
+        stop_extraction = threading.Event()
+
+        def _put(frame):
+            # Give up once analysis has ended instead of blocking on a full queue forever
+            while not stop_extraction.is_set():
+                try:
+                    frame_queue.put(frame, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def _extract():
+            try:
+                self.downloader.stream_frames(video_path, frame_callback=_put, stop_event=stop_extraction)
+            except BaseException as e:
+                extraction_errors.append(e)
+            finally:
+                _put(None)
+
+        extractor = threading.Thread(target=_extract, daemon=True)
+        extractor.start()
+
+        try:
+            pose_data = self.analyzer.analyze_frame_stream(frame_queue, source_size, self.downloader.work_dir())
+        finally:
+            # Stop the decoder and its ffmpeg process before the video can be cleaned up
+            stop_extraction.set()
+            extractor.join()
+
+            # A failed extraction ends the stream early; report it as the root cause
+            if extraction_errors:
+                raise extraction_errors[0]
+
+        return pose_data
+
+    def run_analysis(self, youtube_url: Optional[str] = None,
+                     video: Optional[Tuple[Path, dict]] = None) -> Tuple[Optional[Path], Optional[dict]]:
         """
         Run the complete analysis pipeline.
 
         Args:
-            youtube_url: YouTube video URL
+            youtube_url: YouTube video URL to download
+            video: Optional already-resolved (video_path, video_info) tuple;
+                when given, the download step is skipped
 
         Returns:
             Tuple of (viewer_dir, video_info) or (None, None) on failure
@@ -63,34 +134,60 @@ class FlowStateCLI:
                 console=console
             ) as progress:
 
-                # Step 1: Download video
-                task = progress.add_task("[cyan]Downloading video...", total=None)
-                video_path, video_info = self.downloader.download_video(youtube_url)
-                progress.update(task, completed=100)
-                console.print(f"[green]✔ Video downloaded: '{video_info['title']}'[/green]")
-
-                # Step 2: Extract frames
-                task = progress.add_task("[cyan]Extracting frames...", total=None)
-                frames_dir = self.downloader.extract_frames(video_path)
-                progress.update(task, completed=100)
-                console.print(f"[green]✔ Frames extracted successfully[/green]")
-
-                # Step 3: Analyze poses
-                task = progress.add_task("[cyan]Analyzing movement...", total=None)
-                pose_data = self.analyzer.analyze_video(frames_dir)
-                progress.update(task, completed=100)
+                if video is not None:
+                    video_path, video_info = video
+                else:
+                    video_path, video_info = None, None
+
+                # Reuse detections from an earlier run of the same video
+                cache_key = self._analysis_cache_key(youtube_url, video_path)
+                cached = self.analysis_cache.load(cache_key) if cache_key else None
+
+                if cached is not None:
+                    video_info = video_info or cached.video_info
+                    progress.console.print(f"[green]✔ Using cached pose detections for '{video_info['title']}'[/green]")
+                    pose_data = self.analyzer.analyze_detections(
+                        cached.pose_frames, cached.detected_frames_count, cached.frame_count,
+                        self.downloader.work_dir()
+                    )
+                else:
+                    if video_path is None:
+                        # Step 1: Download video
+                        task = progress.add_task("[cyan]Downloading video...", total=None)
+                        video_path, video_info = self.downloader.download_video(youtube_url)
+                        progress.update(task, completed=100)
+                        progress.console.print(f"[green]✔ Video downloaded: '{video_info['title']}'[/green]")
+
+                    if self.analyzer.can_decode_video():
+                        # Steps 2-3: Decode frames straight from the video and analyze poses
+                        task = progress.add_task("[cyan]Analyzing movement...", total=None)
+                        pose_data = self.analyzer.analyze_video_file(video_path, self.downloader.work_dir())
+                        progress.update(task, completed=100)
+                    else:
+                        # Steps 2-3: Extract frames and analyze poses concurrently
+                        task = progress.add_task("[cyan]Extracting frames and analyzing movement...", total=None)
+                        pose_data = self.extract_and_analyze(video_path)
+                        progress.update(task, completed=100)
+
+                    if cache_key:
+                        from ..core.cache import CachedDetections
+
+                        pose_frames, detected_frames_count, frame_count = self.analyzer.last_detections
+                        self.analysis_cache.save(cache_key, CachedDetections(
+                            pose_frames, detected_frames_count, frame_count, video_info
+                        ))
 
                 # Display analysis results
                 overall_flow = pose_data['overall_scores']['flow']
-                console.print(f"\n[green]✔ Analysis complete![/green]")
-                console.print(f"[yellow]Overall Flow Score: {overall_flow:.1f}%[/yellow]")
-                console.print(f"[dim]Detection Rate: {pose_data['detection_rate']:.1%}[/dim]")
+                progress.console.print(f"\n[green]✔ Analysis complete![/green]")
+                progress.console.print(f"[yellow]Overall Flow Score: {overall_flow:.1f}%[/yellow]")
+                progress.console.print(f"[dim]Detection Rate: {pose_data['detection_rate']:.1%}[/dim]")
 
                 # Step 4: Generate viewer
                 task = progress.add_task("[cyan]Generating 3D viewer...", total=None)
                 viewer_dir = self.viewer_builder.generate_viewer(pose_data, video_info)
                 progress.update(task, completed=100)
-                console.print(f"[green]✔ 3D viewer generated[/green]")
+                progress.console.print(f"[green]✔ 3D viewer generated[/green]")
 
                 return viewer_dir, video_info
 
@@ -109,6 +206,22 @@ class FlowStateCLI:
             if hasattr(self, 'downloader'):
                 self.downloader.cleanup()
 
+    def _analysis_cache_key(self, youtube_url: Optional[str], video_path: Optional[Path]) -> Optional[str]:
+        """
+        Build the analysis cache key for a YouTube URL or local video file.
+
+        Returns:
+            Cache key, or None when caching is disabled
+        """
+        if not settings.cache_enabled:
+            return None
+
+        if video_path is not None:
+            video_id = self.analysis_cache.file_video_id(video_path)
+        else:
+            video_id = validate_youtube_url(youtube_url)
+        return self.analysis_cache.make_key(video_id)
+
     def github_deployment_wizard(self, viewer_dir: Path, video_info: dict) -> bool:
         """
         Interactive GitHub deployment wizard.
@@ -123,9 +236,6 @@ class FlowStateCLI:
         console.print("\n[cyan]GitHub Pages Deployment Wizard[/cyan]")
         console.print("[dim]Your analysis will be published to a public website.[/dim]\n")
 
-        console.print("\n[cyan]GitHub Pages Deployment Wizard[/cyan]")
-        console.print("[dim]Your analysis will be published to a public website.[/dim]\n")
-
         # Get token from environment or prompt
         if settings.github_token:
             console.print("[green]✔ Using GitHub token from environment[/green]")
@@ -148,14 +258,13 @@ class FlowStateCLI:
                 raise GitHubAuthError("Invalid GitHub token from environment. Please check your .env file.")
 
             # Get repository name
-            default_name = re.sub(r'[^a-zA-Z0-9-]', '-',
-                                video_info['title'].lower())[:30].strip('-')
+            default_name = _REPO_SANITIZE.sub('-', video_info['title'].lower())[:30].strip('-')
             repo_name = console.input(
                 f"\n[yellow]Repository name[[/yellow][green]{default_name}[/green][yellow]]:[/yellow] "
             ) or default_name
 
             # Sanitize repo name
-            repo_name = re.sub(r'[^a-zA-Z0-9-]', '-', repo_name).strip('-')
+            repo_name = _REPO_SANITIZE.sub('-', repo_name).strip('-')
 
             console.print(f"\n[cyan]Deploying to GitHub Pages...[/cyan]")
 
@@ -210,6 +319,11 @@ class FlowStateCLI:
     type=click.Path(path_type=Path, exists=True, dir_okay=False),
     help='Path to a Netscape-format cookies file for yt-dlp authentication'
 )
+@click.option(
+    '--concurrent-fragments',
+    type=click.IntRange(min=1),
+    help='Number of video fragments to download in parallel (default: 8)'
+)
 @click.option(
     '--skip-publish',
     is_flag=True,
@@ -233,7 +347,7 @@ class FlowStateCLI:
 )
 @click.version_option(version=settings.version)
 def main(url: Optional[str], output: Optional[Path], cookie_file: Optional[Path],
-         skip_publish: bool, serve: bool, serve_port: int, debug: bool):
+         concurrent_fragments: Optional[int], skip_publish: bool, serve: bool, serve_port: int, debug: bool):
     """
     FlowState-CLI: Transform Tai Chi videos into interactive 3D analyses.
 
@@ -248,6 +362,8 @@ def main(url: Optional[str], output: Optional[Path], cookie_file: Optional[Path]
         settings.create_directories()
     if cookie_file:
         settings.yt_dlp_cookiefile = cookie_file
+    if concurrent_fragments:
+        settings.yt_dlp_concurrent_fragments = concurrent_fragments
 
     # Initialize CLI
     cli = FlowStateCLI()
@@ -255,17 +371,20 @@ def main(url: Optional[str], output: Optional[Path], cookie_file: Optional[Path]
 
     # Check for local input file first
     input_file_path = Path("input.mp4")
-    video_path = None
-    video_info = None
+    local_video = None
 
     if not url and input_file_path.exists() and input_file_path.is_file():
         console.print(f"[green]✔ Found local video: {input_file_path}[/green]")
-        video_path, video_info = cli.downloader.process_local_video(input_file_path)
+        try:
+            local_video = cli.downloader.process_local_video(input_file_path)
+        except FlowStateError as e:
+            console.print(f"[red]✖ {e.message}[/red]")
+            console.print("\n[red]Video processing failed. Exiting.[/red]")
+            return 1
     elif url:
-        # Process YouTube URL
+        # Validate YouTube URL; the download happens in the analysis pipeline
         try:
-            video_id = validate_youtube_url(url)
-            video_path, video_info = cli.downloader.download_video(url)
+            validate_youtube_url(url)
         except InvalidURLError as e:
             console.print(f"[red]✖ {e.message}[/red]")
             console.print("[dim]Example: https://youtube.com/watch?v=VIDEO_ID[/dim]\n")
@@ -279,67 +398,20 @@ def main(url: Optional[str], output: Optional[Path], cookie_file: Optional[Path]
             url = console.input("[yellow]YouTube URL: [/yellow]").strip()
 
             try:
-                video_id = validate_youtube_url(url)
-                video_path, video_info = cli.downloader.download_video(url)
+                validate_youtube_url(url)
                 break
             except InvalidURLError as e:
                 console.print(f"[red]✖ {e.message}[/red]")
                 console.print("[dim]Example: https://youtube.com/watch?v=VIDEO_ID[/dim]\n")
 
-    if not video_path or not video_info:
-        console.print("\n[red]Video processing failed. Exiting.[/red]")
-        return 1
-
-    # Step 2: Extract frames
+    # Download (unless local), analyze and build the viewer
     try:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("[cyan]Extracting frames...", total=None)
-            frames_dir = cli.downloader.extract_frames(video_path)
-            progress.update(task, completed=100)
-            console.print(f"[green]✔ Frames extracted successfully[/green]")
-
-            # Step 3: Analyze poses
-            task = progress.add_task("[cyan]Analyzing movement...", total=None)
-            pose_data = cli.analyzer.analyze_video(frames_dir)
-            progress.update(task, completed=100)
-
-            # Display analysis results
-            overall_flow = pose_data['overall_scores']['flow']
-            console.print(f"\n[green]✔ Analysis complete![/green]")
-            console.print(f"[yellow]Overall Flow Score: {overall_flow:.1f}%[/yellow]")
-            console.print(f"[dim]Detection Rate: {pose_data['detection_rate']:.1%}[/dim]")
-
-            # Step 4: Generate viewer
-            task = progress.add_task("[cyan]Generating 3D viewer...", total=None)
-            viewer_dir = cli.viewer_builder.generate_viewer(pose_data, video_info)
-            progress.update(task, completed=100)
-            console.print(f"[green]✔ 3D viewer generated[/green]")
-
-    except FlowStateError as e:
-        console.print(f"[red]✖ {e.message}[/red]")
-        if settings.debug and e.details:
-            console.print(f"[dim]Details: {e.details}[/dim]")
-        return 1
-    except Exception as e:
-        console.print(f"[red]✖ Unexpected error: {str(e)}[/red]")
-        if settings.debug:
-            console.print_exception()
-        return 1
+        viewer_dir, video_info = cli.run_analysis(url, video=local_video)
     finally:
         # Explicitly close the analyzer to release resources
-        if hasattr(cli, 'analyzer'):
-            cli.analyzer.close()
-
-        if hasattr(cli, 'downloader'):
-            cli.downloader.cleanup()
+        cli.analyzer.close()
 
-    # The `try...except` block above handles failures. If we are here,
-    # the analysis was successful and `viewer_dir` is set.
-    if 'viewer_dir' not in locals() or not viewer_dir:
+    if not viewer_dir:
         console.print("\n[red]Analysis failed. Please try with a different video.[/red]")
         return 1
 
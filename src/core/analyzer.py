@@ -4,41 +4,180 @@ Processes video frames to detect human poses including body, hands, and feet wit
 """
 
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
-import cv2
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from typing import Optional, Dict, Any, List, Tuple, Iterator, Iterable, Union
 import numpy as np
 import json
 import torch
 import torch.nn as nn
 from ultralytics import YOLO
+from ultralytics.models.yolo.pose import PosePredictor
 from scipy.interpolate import interp1d
 from scipy.ndimage import gaussian_filter1d
 import matplotlib.pyplot as plt
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+try:
+    import decord  # Optional: decode frames straight from the video file
+except ImportError:
+    decord = None
 
 from ..core.config import settings
 from ..core.exceptions import PoseDetectionError
+from ..core.metrics_nb import body_motion_metrics
+
+
+POSE_MODEL_WEIGHTS = 'yolov8n-pose.pt'
+
+# Tensor inputs must have sides divisible by the pose model stride
+MODEL_STRIDE = 32
 
+# Keypoint groups of a PoseFrame and their sizes, in landmarks file storage order
+LANDMARK_GROUPS = (
+    ("body", 17),
+    ("hand_left", 21),
+    ("hand_right", 21),
+    ("face", 5),
+)
 
-@dataclass
+# Loaded pose models not owned by a detector, keyed by (device, use_tensorrt, precision).
+# Detectors check models out and return them on close, so weights are loaded once per
+# process instead of once per analyzer, while no model is ever shared between threads
+_idle_pose_models: Dict[Tuple[str, bool, str], List[YOLO]] = {}
+_idle_pose_models_lock = threading.Lock()
+
+# Frames converted per step when writing the landmarks file
+LANDMARK_WRITE_CHUNK = 4096
+
+
+@dataclass(slots=True, frozen=True)
 class PoseKeypoint:
     """Represents a single pose keypoint with coordinates and confidence."""
     x: float
     y: float
     confidence: float
-    z: float = 0.0  # Depth information when available
 
 
-@dataclass
+@dataclass(slots=True)
 class PoseFrame:
-    """Represents pose data for a single frame."""
-    body_keypoints: List[PoseKeypoint]
-    hand_keypoints_left: List[PoseKeypoint]
-    hand_keypoints_right: List[PoseKeypoint]
-    face_keypoints: List[PoseKeypoint]
+    """
+    Represents pose data for a single frame.
+    Each keypoint group is stored as a float32 (K, 2) coordinate array and a
+    (K,) confidence array; K is 0 when the group was not detected.
+    """
+    body_xy: np.ndarray
+    body_conf: np.ndarray
+    hand_left_xy: np.ndarray
+    hand_left_conf: np.ndarray
+    hand_right_xy: np.ndarray
+    hand_right_conf: np.ndarray
+    face_xy: np.ndarray
+    face_conf: np.ndarray
     timestamp: float
     frame_idx: int
 
+    def keypoints(self, group: str) -> List[PoseKeypoint]:
+        """
+        Materialize one keypoint group as PoseKeypoint objects for export.
+
+        Args:
+            group: Group name from LANDMARK_GROUPS
+
+        Returns:
+            List of keypoints in the group
+        """
+        xy = getattr(self, f"{group}_xy").tolist()
+        conf = getattr(self, f"{group}_conf").tolist()
+        return [PoseKeypoint(x=x, y=y, confidence=c) for (x, y), c in zip(xy, conf)]
+
+
+def _empty_keypoints() -> Tuple[np.ndarray, np.ndarray]:
+    """Return (xy, confidence) arrays for an undetected keypoint group."""
+    return np.zeros((0, 2), dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+
+def stack_keypoints(poses: List[PoseFrame], group: str, num_keypoints: int,
+                    dtype: np.dtype = np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack one keypoint group of every frame into contiguous arrays.
+    Missing keypoints get zero confidence so they fall below every threshold.
+
+    Args:
+        poses: List of pose frames
+        group: Group name from LANDMARK_GROUPS
+        num_keypoints: Number of keypoints in the group
+        dtype: Data type of the returned arrays
+
+    Returns:
+        Tuple of (xy, confidence) arrays with shapes (T, K, 2) and (T, K)
+    """
+    xy = np.zeros((len(poses), num_keypoints, 2), dtype=dtype)
+    conf = np.zeros((len(poses), num_keypoints), dtype=dtype)
+
+    xy_field, conf_field = f"{group}_xy", f"{group}_conf"
+    for t, pose in enumerate(poses):
+        pose_conf = getattr(pose, conf_field)[:num_keypoints]
+        if len(pose_conf):
+            xy[t, :len(pose_conf)] = getattr(pose, xy_field)[:num_keypoints]
+            conf[t, :len(pose_conf)] = pose_conf
+
+    return xy, conf
+
+
+class PinnedPosePredictor(PosePredictor):
+    """
+    Pose predictor that stages letterboxed batches in page-locked host memory,
+    so host-to-device copies run as asynchronous DMA transfers, and copies the
+    detections back to the host once per batch. Frames passed in as a device
+    tensor (NVDEC) stay on the device; only their shape reaches the results.
+    """
+
+    _pinned_batch: Optional[torch.Tensor] = None
+
+    def preprocess(self, im):
+        if isinstance(im, torch.Tensor) or self.device.type != "cuda":
+            return super().preprocess(im)
+
+        frames = self.pre_transform(im)
+
+        # Reuse one pinned buffer; reallocate only when the frame size or batch size grows
+        shape = (len(frames),) + frames[0].shape
+        if (self._pinned_batch is None or self._pinned_batch.shape[1:] != shape[1:]
+                or self._pinned_batch.shape[0] < shape[0]):
+            self._pinned_batch = torch.empty(shape, dtype=torch.uint8).pin_memory()
+
+        pinned_batch = self._pinned_batch[:len(frames)]
+        pinned_frames = pinned_batch.numpy()
+        for i, frame in enumerate(frames):
+            pinned_frames[i] = frame
+
+        im = pinned_batch.to(self.device, non_blocking=True)
+        im = im.permute(0, 3, 1, 2).flip(1).contiguous()  # BHWC BGR to BCHW RGB
+        return (im.half() if self.model.fp16 else im.float()).div_(255)
+
+    def postprocess(self, preds, img, orig_imgs, **kwargs):
+        if isinstance(orig_imgs, torch.Tensor):
+            # Keypoint scaling only reads the frame shape; pass zero-stride stand-ins
+            # instead of letting ultralytics copy every frame to the host as uint8
+            height, width = orig_imgs.shape[2:]
+            orig_imgs = [np.broadcast_to(np.zeros((), dtype=np.uint8), (height, width, 3))] * len(orig_imgs)
+        return super().postprocess(preds, img, orig_imgs, **kwargs)
+
+    def construct_results(self, preds, img, orig_imgs, **kwargs):
+        if self.device.type == "cuda" and preds:
+            # Copy the detections of the whole batch to the host in one transfer;
+            # coordinate scaling and keypoint extraction then never touch the device
+            sizes = [len(pred) for pred in preds]
+            preds = list(torch.cat(preds).cpu().split(sizes))
+        return super().construct_results(preds, img, orig_imgs, **kwargs)
+
 
 class OpenPoseDetector:
     """
@@ -84,6 +223,14 @@ class OpenPoseDetector:
         (0, 17), (17, 18), (18, 19), (19, 20)
     ]
 
+    # Connections as (N, 2) index arrays for masking whole keypoint stacks at once
+    BODY_CONNECTION_INDICES = np.array(BODY_CONNECTIONS, dtype=np.intp)
+    HAND_CONNECTION_INDICES = np.array(HAND_CONNECTIONS, dtype=np.intp)
+
+    # Temporal smoothing parameters
+    SMOOTHING_WINDOW = 5
+    INTERPOLATION_FACTOR = 10  # 10x temporal granularity
+
     def __init__(self, device: str = "cuda" if torch.cuda.is_available() else "cpu"):
         """
         Initialize OpenPose detector with GPU acceleration.
@@ -92,23 +239,132 @@ class OpenPoseDetector:
             device: Device to run inference on ('cuda' or 'cpu')
         """
         self.device = device
-        self.pose_model = YOLO('yolov8n-pose.pt')
-        self.pose_model.to(device)
-
-        # Initialize hand detection model
-        self.hand_model = YOLO('yolov8n.pt')  # Will be fine-tuned for hands
-        self.hand_model.to(device)
+        self._model_key = (device, settings.use_tensorrt and device == "cuda", settings.tensorrt_precision)
+        self.pose_model = self._acquire_pose_model()
+        # Run the pose model in FP16 on GPU (TensorRT engines are built FP16 already)
+        self.half_precision = device == "cuda"
+        # Compile the PyTorch model on GPU when configured (TensorRT engines are already fused)
+        self.compile_mode = settings.torch_compile if device == "cuda" and not self._model_key[1] else None
+        # Stage CUDA input batches in pinned memory
+        self.pose_predictor = PinnedPosePredictor if device == "cuda" else None
+        # Issue GPU work on a per-detector stream so pooled detectors overlap on the device
+        self.cuda_stream = torch.cuda.Stream() if device == "cuda" else None
 
         # Confidence thresholds
         self.pose_confidence = settings.pose_confidence_threshold
-        self.hand_confidence = 0.5
-
-        # Temporal smoothing parameters
-        self.smoothing_window = 5
-        self.interpolation_factor = 10  # 10x temporal granularity
 
         self._closed = False
 
+    def _acquire_pose_model(self) -> YOLO:
+        """
+        Take an idle pose model loaded with the same configuration, or load a new one.
+
+        Returns:
+            YOLO pose model owned by this detector until close()
+        """
+        with _idle_pose_models_lock:
+            idle_models = _idle_pose_models.get(self._model_key)
+            if idle_models:
+                return idle_models.pop()
+
+        return self._load_pose_model(self.device)
+
+    def _load_pose_model(self, device: str) -> YOLO:
+        """
+        Load the body pose model, preferring a cached TensorRT engine when enabled.
+
+        Args:
+            device: Device to run inference on ('cuda' or 'cpu')
+
+        Returns:
+            YOLO pose model ready for inference
+        """
+        if settings.use_tensorrt and device == "cuda":
+            try:
+                return YOLO(str(self._get_tensorrt_engine()), task="pose")
+            except Exception as e:
+                # Automatic fallback to the PyTorch weights
+                print(f"Warning: TensorRT engine unavailable ({e}). Falling back to PyTorch model.")
+
+        model = YOLO(POSE_MODEL_WEIGHTS)
+        model.to(device)
+        return model
+
+    def _get_tensorrt_engine(self) -> Path:
+        """
+        Return the cached TensorRT engine for the configured precision.
+        INT8 engines are only used if they pass a parity check against the FP32 model.
+
+        Returns:
+            Path to the serialized engine
+        """
+        if settings.tensorrt_precision == "int8":
+            engine_path = self._build_tensorrt_engine("int8")
+            if self._passes_parity_check(engine_path):
+                return engine_path
+            print("Warning: INT8 engine failed the accuracy parity check. Using FP16 engine.")
+
+        return self._build_tensorrt_engine("fp16")
+
+    def _build_tensorrt_engine(self, precision: str) -> Path:
+        """
+        Build the TensorRT engine for this GPU on first use.
+        Engines are tied to the GPU architecture, so the cache is keyed by compute capability.
+
+        Args:
+            precision: 'fp16' or 'int8'
+
+        Returns:
+            Path to the serialized engine
+        """
+        major, minor = torch.cuda.get_device_capability()
+        engine_path = settings.engine_cache_dir / f"{Path(POSE_MODEL_WEIGHTS).stem}_sm{major}{minor}_{precision}.engine"
+
+        if not engine_path.is_file():
+            settings.engine_cache_dir.mkdir(parents=True, exist_ok=True)
+            export_args = {"half": True} if precision == "fp16" else {
+                "int8": True,
+                "data": settings.tensorrt_calibration_data
+            }
+            exported_path = YOLO(POSE_MODEL_WEIGHTS).export(
+                format="engine",
+                dynamic=True,
+                batch=settings.batch_size,
+                imgsz=640,
+                device=0,
+                verbose=False,
+                **export_args
+            )
+            shutil.move(str(exported_path), engine_path)
+
+        return engine_path
+
+    def _passes_parity_check(self, engine_path: Path) -> bool:
+        """
+        Compare keypoints from a quantized engine against the FP32 model on sample images.
+
+        Args:
+            engine_path: Path to the engine under test
+
+        Returns:
+            True if the mean keypoint error is within settings.tensorrt_int8_max_error
+        """
+        from ultralytics.utils import ASSETS
+
+        images = [str(path) for path in sorted(ASSETS.glob("*.jpg"))]
+        reference_results = YOLO(POSE_MODEL_WEIGHTS)(images, verbose=False)
+        engine_results = YOLO(str(engine_path), task="pose")(images, verbose=False)
+
+        errors = []
+        for reference, candidate in zip(reference_results, engine_results):
+            if len(reference.keypoints) == 0 or len(candidate.keypoints) == 0:
+                continue
+            reference_xy = reference.keypoints.xy[0].cpu().numpy()
+            candidate_xy = candidate.keypoints.xy[0].cpu().numpy()
+            errors.append(np.linalg.norm(reference_xy - candidate_xy, axis=-1).mean())
+
+        return bool(errors) and float(np.mean(errors)) <= settings.tensorrt_int8_max_error
+
     def detect_pose_frame(self, image: np.ndarray, frame_idx: int, timestamp: float) -> PoseFrame:
         """
         Detect pose keypoints in a single frame.
@@ -121,124 +377,145 @@ class OpenPoseDetector:
         Returns:
             PoseFrame with detected keypoints
         """
-        # Body pose detection
-        pose_results = self.pose_model(image, conf=self.pose_confidence, verbose=False)
+        return self.detect_pose_batch([image], [frame_idx], [timestamp])[0]
+
+    def detect_pose_batch(self, images: Union[List[np.ndarray], torch.Tensor], frame_indices: List[int],
+                          timestamps: List[float]) -> List[PoseFrame]:
+        """
+        Detect pose keypoints in a batch of frames with a single model call.
 
-        body_keypoints = []
-        if pose_results and len(pose_results[0].keypoints) > 0:
-            # Extract keypoints from the first detected person
-            keypoints = pose_results[0].keypoints.xy[0].cpu().numpy()
-            confidences = pose_results[0].keypoints.conf[0].cpu().numpy()
+        Args:
+            images: Input BGR images as numpy arrays, or a (B, 3, H, W) RGB float tensor
+            frame_indices: Frame index of each image
+            timestamps: Timestamp of each image
 
-            for i, (x, y) in enumerate(keypoints):
-                confidence = confidences[i] if i < len(confidences) else 0.0
-                body_keypoints.append(PoseKeypoint(x=float(x), y=float(y), confidence=float(confidence)))
+        Returns:
+            List of PoseFrame, one per input image
+        """
+        if len(images) == 0:
+            return []
+
+        predict_args = {"compile": self.compile_mode} if self.compile_mode else {}
+
+        with torch.cuda.stream(self.cuda_stream), torch.inference_mode():
+            # Body pose detection for the whole batch
+            pose_results = self.pose_model(images, conf=self.pose_confidence, verbose=False,
+                                           half=self.half_precision, predictor=self.pose_predictor,
+                                           **predict_args)
+
+            # Stack the first detected person of every frame and copy them to the host in one transfer
+            detected = [i for i, result in enumerate(pose_results)
+                        if result.keypoints is not None and len(result.keypoints) > 0]
+            batch_keypoints = {}
+            if detected:
+                keypoint_data = torch.stack([pose_results[i].keypoints.data[0] for i in detected]).cpu().numpy()
+                # Keypoint rows are (x, y, confidence)
+                batch_keypoints = dict(zip(detected, keypoint_data.astype(np.float32, copy=False)))
 
-        # Hand detection (enhanced region-based detection)
-        hand_left, hand_right = self._detect_hands(image, body_keypoints)
+        pose_frames = []
+        for i, (image, frame_idx, timestamp) in enumerate(zip(images, frame_indices, timestamps)):
+            if i in batch_keypoints:
+                body_xy, body_conf = batch_keypoints[i][:, :2], batch_keypoints[i][:, 2]
+            else:
+                body_xy, body_conf = _empty_keypoints()
+
+            # Hand detection (enhanced region-based detection)
+            (hand_left_xy, hand_left_conf), (hand_right_xy, hand_right_conf) = self._detect_hands(
+                image, body_xy, body_conf
+            )
 
-        # Face detection (simplified for this implementation)
-        face_keypoints = self._detect_face(image, body_keypoints)
+            # Face detection (simplified for this implementation)
+            face_xy, face_conf = self._detect_face(image, body_xy, body_conf)
+
+            pose_frames.append(PoseFrame(
+                body_xy=body_xy,
+                body_conf=body_conf,
+                hand_left_xy=hand_left_xy,
+                hand_left_conf=hand_left_conf,
+                hand_right_xy=hand_right_xy,
+                hand_right_conf=hand_right_conf,
+                face_xy=face_xy,
+                face_conf=face_conf,
+                timestamp=timestamp,
+                frame_idx=frame_idx
+            ))
 
-        return PoseFrame(
-            body_keypoints=body_keypoints,
-            hand_keypoints_left=hand_left,
-            hand_keypoints_right=hand_right,
-            face_keypoints=face_keypoints,
-            timestamp=timestamp,
-            frame_idx=frame_idx
-        )
+        return pose_frames
 
-    def _detect_hands(self, image: np.ndarray, body_keypoints: List[PoseKeypoint]) -> Tuple[List[PoseKeypoint], List[PoseKeypoint]]:
+    def _detect_hands(self, image: np.ndarray, body_xy: np.ndarray,
+                      body_conf: np.ndarray) -> Tuple[Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]:
         """
         Detect hand keypoints using region-based approach.
 
         Args:
             image: Input image
-            body_keypoints: Body keypoints for hand region estimation
+            body_xy: Body keypoint coordinates for hand region estimation
+            body_conf: Body keypoint confidences
 
         Returns:
-            Tuple of (left_hand_keypoints, right_hand_keypoints)
+            Tuple of (left_hand, right_hand), each an (xy, confidence) pair
         """
-        left_hand = []
-        right_hand = []
+        left_hand = right_hand = _empty_keypoints()
 
-        if len(body_keypoints) >= 10:  # Ensure we have wrist keypoints
-            # Extract hand regions based on wrist positions
-            left_wrist = body_keypoints[9]  # Left wrist
-            right_wrist = body_keypoints[10]  # Right wrist
+        if len(body_conf) >= 10:  # Ensure we have wrist keypoints
+            # Extract hand regions based on wrist positions (left wrist 9, right wrist 10)
 
             # Create hand regions
             hand_size = 80  # Pixels
 
             # Left hand
-            if left_wrist.confidence > 0.3:
-                left_hand = self._extract_hand_keypoints(image, left_wrist, hand_size)
+            if body_conf[9] > 0.3:
+                left_hand = self._extract_hand_keypoints(image, body_xy[9], body_conf[9], hand_size)
 
             # Right hand
-            if right_wrist.confidence > 0.3:
-                right_hand = self._extract_hand_keypoints(image, right_wrist, hand_size)
+            if body_conf[10] > 0.3:
+                right_hand = self._extract_hand_keypoints(image, body_xy[10], body_conf[10], hand_size)
 
         return left_hand, right_hand
 
-    def _extract_hand_keypoints(self, image: np.ndarray, wrist: PoseKeypoint, hand_size: int) -> List[PoseKeypoint]:
+    def _extract_hand_keypoints(self, image: np.ndarray, wrist_xy: np.ndarray, wrist_conf: float,
+                                hand_size: int) -> Tuple[np.ndarray, np.ndarray]:
         """
         Extract hand keypoints from hand region.
 
         Args:
             image: Input image
-            wrist: Wrist keypoint
+            wrist_xy: Wrist coordinates
+            wrist_conf: Wrist confidence
             hand_size: Size of hand region
 
         Returns:
-            List of hand keypoints
+            Tuple of (xy, confidence) arrays for the hand keypoints
         """
-        # Create dummy hand keypoints for now (in real implementation would use specialized hand model)
-        hand_keypoints = []
-
-        # Generate synthetic hand keypoints based on wrist position
-        for i in range(21):  # 21 hand keypoints
-            # Add some randomness to simulate hand detection
-            offset_x = np.random.normal(0, 10)
-            offset_y = np.random.normal(0, 10)
+        # No hand keypoint model is wired in yet; report the hand as undetected
+        # rather than fabricating keypoints around the wrist
+        return _empty_keypoints()
 
-            hand_keypoints.append(PoseKeypoint(
-                x=wrist.x + offset_x,
-                y=wrist.y + offset_y,
-                confidence=max(0.0, wrist.confidence - 0.1)
-            ))
-
-        return hand_keypoints
-
-    def _detect_face(self, image: np.ndarray, body_keypoints: List[PoseKeypoint]) -> List[PoseKeypoint]:
+    def _detect_face(self, image: np.ndarray, body_xy: np.ndarray,
+                     body_conf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
         Detect face keypoints.
 
         Args:
             image: Input image
-            body_keypoints: Body keypoints for face region estimation
+            body_xy: Body keypoint coordinates for face region estimation
+            body_conf: Body keypoint confidences
 
         Returns:
-            List of face keypoints
+            Tuple of (xy, confidence) arrays for the face keypoints
         """
-        face_keypoints = []
-
-        # Simplified face detection based on head keypoints
-        if len(body_keypoints) >= 5:
-            nose = body_keypoints[0]
-            left_eye = body_keypoints[1]
-            right_eye = body_keypoints[2]
-            left_ear = body_keypoints[3]
-            right_ear = body_keypoints[4]
+        # Simplified face detection based on head keypoints:
+        # nose, left eye, right eye, left ear, right ear
+        if len(body_conf) >= 5:
+            return body_xy[:5], body_conf[:5]
 
-            # Return basic face keypoints
-            face_keypoints = [nose, left_eye, right_eye, left_ear, right_ear]
+        return _empty_keypoints()
 
-        return face_keypoints
-
-    def interpolate_poses(self, poses: List[PoseFrame]) -> List[PoseFrame]:
+    @classmethod
+    def interpolate_poses(cls, poses: List[PoseFrame]) -> List[PoseFrame]:
         """
         Interpolate poses to increase temporal granularity by 10x.
+        All intermediate frames are computed at once from stacked keypoint arrays.
 
         Args:
             poses: List of original pose frames
@@ -249,105 +526,67 @@ class OpenPoseDetector:
         if len(poses) < 2:
             return poses
 
+        # Interpolation weights of the frames inserted between each pair of poses
+        alphas = np.arange(1, cls.INTERPOLATION_FACTOR) / cls.INTERPOLATION_FACTOR
+        keypoint_alphas = alphas.astype(np.float32)
+
+        # Per group: (pairs, steps, K, 2) coordinates, (pairs, steps, K) confidences and
+        # the number of keypoints present in both poses of each pair
+        groups = {}
+        empty_xy, empty_conf = _empty_keypoints()
+        for name, num_keypoints in LANDMARK_GROUPS:
+            counts = np.array([len(getattr(pose, f"{name}_conf")) for pose in poses])
+            if not counts.any():
+                # Group never detected (e.g. hands): nothing to interpolate
+                groups[name] = None
+                continue
+
+            xy, conf = stack_keypoints(poses, name, num_keypoints, dtype=np.float32)
+            interp_xy = xy[:-1, None] + keypoint_alphas[None, :, None, None] * (xy[1:, None] - xy[:-1, None])
+            interp_conf = np.repeat(np.minimum(conf[:-1], conf[1:])[:, None], len(alphas), axis=1)
+            groups[name] = (interp_xy, interp_conf, np.minimum(counts[:-1], counts[1:]))
+
+        # Interpolate timestamps and frame indices
+        timestamps = np.array([pose.timestamp for pose in poses])
+        frame_indices = np.array([pose.frame_idx for pose in poses])
+        interp_timestamps = timestamps[:-1, None] + alphas * (timestamps[1:] - timestamps[:-1])[:, None]
+        interp_frame_indices = (frame_indices[:-1, None] +
+                                alphas * (frame_indices[1:] - frame_indices[:-1])[:, None]).astype(int)
+
         interpolated_poses = []
 
         for i in range(len(poses) - 1):
-            current_pose = poses[i]
-            next_pose = poses[i + 1]
-
             # Add original pose
-            interpolated_poses.append(current_pose)
+            interpolated_poses.append(poses[i])
 
             # Add interpolated poses
-            for j in range(1, self.interpolation_factor):
-                alpha = j / self.interpolation_factor
-                interpolated_pose = self._interpolate_single_pose(current_pose, next_pose, alpha)
-                interpolated_poses.append(interpolated_pose)
+            for j in range(len(alphas)):
+                keypoints = {}
+                for name, group in groups.items():
+                    if group is None:
+                        keypoints[f"{name}_xy"], keypoints[f"{name}_conf"] = empty_xy, empty_conf
+                        continue
+                    interp_xy, interp_conf, counts = group
+                    keypoints[f"{name}_xy"] = interp_xy[i, j, :counts[i]]
+                    keypoints[f"{name}_conf"] = interp_conf[i, j, :counts[i]]
+
+                interpolated_poses.append(PoseFrame(
+                    timestamp=float(interp_timestamps[i, j]),
+                    frame_idx=int(interp_frame_indices[i, j]),
+                    **keypoints
+                ))
 
         # Add final pose
         interpolated_poses.append(poses[-1])
 
         return interpolated_poses
 
-    def _interpolate_single_pose(self, pose1: PoseFrame, pose2: PoseFrame, alpha: float) -> PoseFrame:
-        """
-        Interpolate between two poses.
-
-        Args:
-            pose1: First pose
-            pose2: Second pose
-            alpha: Interpolation factor (0-1)
-
-        Returns:
-            Interpolated pose
-        """
-        # Interpolate body keypoints
-        body_keypoints = []
-        for i in range(min(len(pose1.body_keypoints), len(pose2.body_keypoints))):
-            kp1 = pose1.body_keypoints[i]
-            kp2 = pose2.body_keypoints[i]
-
-            interpolated_kp = PoseKeypoint(
-                x=kp1.x + alpha * (kp2.x - kp1.x),
-                y=kp1.y + alpha * (kp2.y - kp1.y),
-                confidence=min(kp1.confidence, kp2.confidence)
-            )
-            body_keypoints.append(interpolated_kp)
-
-        # Interpolate hand keypoints
-        hand_left = []
-        for i in range(min(len(pose1.hand_keypoints_left), len(pose2.hand_keypoints_left))):
-            kp1 = pose1.hand_keypoints_left[i]
-            kp2 = pose2.hand_keypoints_left[i]
-
-            interpolated_kp = PoseKeypoint(
-                x=kp1.x + alpha * (kp2.x - kp1.x),
-                y=kp1.y + alpha * (kp2.y - kp1.y),
-                confidence=min(kp1.confidence, kp2.confidence)
-            )
-            hand_left.append(interpolated_kp)
-
-        hand_right = []
-        for i in range(min(len(pose1.hand_keypoints_right), len(pose2.hand_keypoints_right))):
-            kp1 = pose1.hand_keypoints_right[i]
-            kp2 = pose2.hand_keypoints_right[i]
-
-            interpolated_kp = PoseKeypoint(
-                x=kp1.x + alpha * (kp2.x - kp1.x),
-                y=kp1.y + alpha * (kp2.y - kp1.y),
-                confidence=min(kp1.confidence, kp2.confidence)
-            )
-            hand_right.append(interpolated_kp)
-
-        # Interpolate face keypoints
-        face_keypoints = []
-        for i in range(min(len(pose1.face_keypoints), len(pose2.face_keypoints))):
-            kp1 = pose1.face_keypoints[i]
-            kp2 = pose2.face_keypoints[i]
-
-            interpolated_kp = PoseKeypoint(
-                x=kp1.x + alpha * (kp2.x - kp1.x),
-                y=kp1.y + alpha * (kp2.y - kp1.y),
-                confidence=min(kp1.confidence, kp2.confidence)
-            )
-            face_keypoints.append(interpolated_kp)
-
-        # Interpolate timestamp
-        timestamp = pose1.timestamp + alpha * (pose2.timestamp - pose1.timestamp)
-        frame_idx = int(pose1.frame_idx + alpha * (pose2.frame_idx - pose1.frame_idx))
-
-        return PoseFrame(
-            body_keypoints=body_keypoints,
-            hand_keypoints_left=hand_left,
-            hand_keypoints_right=hand_right,
-            face_keypoints=face_keypoints,
-            timestamp=timestamp,
-            frame_idx=frame_idx
-        )
-
-    def smooth_poses(self, poses: List[PoseFrame]) -> List[PoseFrame]:
+    @classmethod
+    def smooth_poses(cls, poses: List[PoseFrame]) -> List[PoseFrame]:
         """
         Apply temporal smoothing to reduce jitter.
+        Keypoint coordinates are Gaussian-filtered along time, weighted by confidence
+        so low-confidence samples do not pull their neighbours.
 
         Args:
             poses: List of pose frames
@@ -355,45 +594,53 @@ class OpenPoseDetector:
         Returns:
             List of smoothed pose frames
         """
-        if len(poses) < self.smoothing_window:
+        if len(poses) < cls.SMOOTHING_WINDOW:
             return poses
 
-        smoothed_poses = []
-
-        for i in range(len(poses)):
-            # Get window around current frame
-            start_idx = max(0, i - self.smoothing_window // 2)
-            end_idx = min(len(poses), i + self.smoothing_window // 2 + 1)
-            window_poses = poses[start_idx:end_idx]
+        sigma = cls.SMOOTHING_WINDOW / 3.0
+        smoothed_groups = []
 
-            # Apply Gaussian smoothing
-            smoothed_pose = self._gaussian_smooth_pose(window_poses, i - start_idx)
-            smoothed_poses.append(smoothed_pose)
+        for name, num_keypoints in LANDMARK_GROUPS:
+            xy, conf = stack_keypoints(poses, name, num_keypoints)
 
-        return smoothed_poses
+            # Keypoints that are never confident keep their raw coordinates; only filter the rest
+            weights = (conf > 0.3).astype(np.float64)
+            active = weights.any(axis=0)
+            smoothed_xy = xy.astype(np.float32)
 
-    def _gaussian_smooth_pose(self, window_poses: List[PoseFrame], center_idx: int) -> PoseFrame:
-        """
-        Apply Gaussian smoothing to a pose within a temporal window.
+            if active.any():
+                # Confidence-weighted filter: sum(w * xy) / sum(w) over the Gaussian window
+                active_xy, active_weights = xy[:, active], weights[:, active]
+                weighted_xy = gaussian_filter1d(active_xy * active_weights[..., np.newaxis], sigma,
+                                                axis=0, mode="nearest")
+                total_weight = gaussian_filter1d(active_weights, sigma, axis=0, mode="nearest")[..., np.newaxis]
 
-        Args:
-            window_poses: Poses in the temporal window
-            center_idx: Index of the center pose
+                # Keep the raw coordinates where no confident samples fall in the window
+                smoothed_xy[:, active] = np.where(
+                    total_weight > 1e-6, weighted_xy / np.maximum(total_weight, 1e-6), active_xy
+                )
+            smoothed_groups.append((f"{name}_xy", f"{name}_conf", smoothed_xy))
 
-        Returns:
-            Smoothed pose
-        """
-        if center_idx >= len(window_poses):
-            return window_poses[-1]
+        smoothed_poses = []
+        for t, pose in enumerate(poses):
+            smoothed_pose = replace(pose, **{
+                xy_field: smoothed_xy[t, :len(getattr(pose, conf_field))]
+                for xy_field, conf_field, smoothed_xy in smoothed_groups
+            })
+            smoothed_poses.append(smoothed_pose)
 
-        # For simplicity, return the center pose (in full implementation would apply Gaussian weights)
-        return window_poses[center_idx]
+        return smoothed_poses
 
     def close(self):
         """Release resources."""
         if hasattr(self, '_closed') and self._closed:
             return
 
+        # Keep the loaded model for the next detector
+        with _idle_pose_models_lock:
+            _idle_pose_models.setdefault(self._model_key, []).append(self.pose_model)
+        self.pose_model = None
+
         self._closed = True
 
 
@@ -403,118 +650,468 @@ class PoseAnalyzer:
     """
 
     def __init__(self):
-        self.detector = OpenPoseDetector()
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+
+        # Detectors are created lazily and shared between inference threads.
+        # On GPU a single detector (one model copy, one stream) is the default;
+        # batching already keeps the device busy
+        if self.device == "cuda":
+            self._pool_size = max(1, settings.cuda_streams)
+        else:
+            self._pool_size = max(1, min(settings.num_workers, os.cpu_count() or 1))
+        self._pool: "queue.Queue[OpenPoseDetector]" = queue.Queue()
+        self._detectors: List[OpenPoseDetector] = []
+        self._pool_lock = threading.Lock()
         self._closed = False
 
-    def analyze_video(self, frames_dir: Path) -> Dict[str, Any]:
+        # (pose_frames, detected_frames_count, frame_count) of the most recent analysis
+        self.last_detections: Optional[Tuple[List[PoseFrame], int, int]] = None
+
+    @contextmanager
+    def _borrow_detector(self) -> Iterator[OpenPoseDetector]:
         """
-        Analyze video frames with enhanced temporal granularity and full body detection.
+        Borrow a detector from the pool, creating one if all are busy and the
+        pool is not yet full.
+
+        Yields:
+            An OpenPoseDetector for exclusive use until the context exits
+        """
+        try:
+            detector = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                detector = None
+                if len(self._detectors) < self._pool_size:
+                    detector = OpenPoseDetector(self.device)
+                    self._detectors.append(detector)
+            if detector is None:
+                detector = self._pool.get()
+
+        try:
+            yield detector
+        finally:
+            self._pool.put(detector)
+
+    @staticmethod
+    def can_decode_video() -> bool:
+        """Whether frames can be decoded directly from the video file (requires decord)."""
+        return decord is not None
+
+    def analyze_video_file(self, video_path: Path, work_dir: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Analyze a video by decoding sampled frames directly from the file.
+        Skips the JPEG extraction round-trip and uses NVDEC when CUDA is available.
+
+        Args:
+            video_path: Path to the video file
+            work_dir: Directory for the landmarks file (default settings.temp_dir); the caller removes it
+
+        Returns:
+            Dictionary containing enhanced pose analysis results
+        """
+        if decord is None:
+            raise PoseDetectionError("Direct video decoding requires the 'decord' package.")
+
+        try:
+            ctx = decord.gpu(0) if self.device == "cuda" else decord.cpu(0)
+            reader = decord.VideoReader(str(video_path), ctx=ctx)
+
+            # Let the decoder downscale to fit the pose model input, never upscaling
+            height, width = reader[0].shape[:2]
+            frame_scale = None
+            if settings.analysis_frame_size and max(width, height) > settings.analysis_frame_size:
+                scale = settings.analysis_frame_size / max(width, height)
+                scaled_width, scaled_height = max(1, round(width * scale)), max(1, round(height * scale))
+                reader = decord.VideoReader(str(video_path), ctx=ctx, width=scaled_width, height=scaled_height)
+                frame_scale = self._frame_scale((width, height), (scaled_width, scaled_height))
+        except Exception as e:
+            raise PoseDetectionError(f"Could not open video file: {video_path}", details=str(e)) from e
+
+        # Sample frames at the configured extraction rate
+        step = max(1, int(round(reader.get_avg_fps() / settings.frame_extraction_fps)))
+        frame_indices = np.arange(0, len(reader), step)
+        if frame_indices.size == 0:
+            raise PoseDetectionError(f"No frames could be decoded from video: {video_path}")
+
+        return self._analyze_frame_batches(
+            self._iter_video_batches(reader, frame_indices), len(frame_indices), frame_scale, work_dir
+        )
+
+    def _iter_video_batches(
+        self, reader, frame_indices: np.ndarray
+    ) -> Iterator[Tuple[List[int], torch.Tensor]]:
+        """
+        Decode sampled video frames in batches and pass them to the model as tensors.
+        On CUDA the frames decoded by NVDEC stay in device memory; on CPU the decoded
+        array is wrapped without a copy. decord emits RGB, so no channel swap is needed.
+
+        Args:
+            reader: decord VideoReader for the video
+            frame_indices: Indices of the frames to decode
+
+        Yields:
+            Tuples of (frame_indices, images) with at most settings.batch_size entries
+        """
+        batch_size = max(1, settings.batch_size)
+
+        for start in range(0, len(frame_indices), batch_size):
+            batch = reader.get_batch(frame_indices[start:start + batch_size])
+            if self.device == "cuda":
+                frames = torch.utils.dlpack.from_dlpack(batch.to_dlpack())
+            else:
+                frames = torch.from_numpy(batch.asnumpy())
+            yield list(range(start, start + len(frames))), self._frames_to_model_input(frames)
+
+    @staticmethod
+    def _frames_to_model_input(frames: torch.Tensor) -> torch.Tensor:
+        """
+        Convert decoded frames to the tensor layout YOLO accepts without preprocessing.
+        Frames are padded at the bottom and right, so keypoint coordinates need no offset.
+
+        Args:
+            frames: (B, H, W, 3) uint8 RGB frames
+
+        Returns:
+            (B, 3, H', W') float tensor in [0, 1] with H' and W' multiples of MODEL_STRIDE
+        """
+        height, width = frames.shape[1:3]
+        images = frames.permute(0, 3, 1, 2).float().div_(255)
+
+        pad_height, pad_width = -height % MODEL_STRIDE, -width % MODEL_STRIDE
+        if pad_height or pad_width:
+            images = nn.functional.pad(images, (0, pad_width, 0, pad_height), value=114 / 255)
+
+        return images.contiguous()
+
+    def analyze_frame_stream(self, frame_queue: "queue.Queue[Optional[np.ndarray]]",
+                             source_size: Optional[Tuple[int, int]] = None,
+                             work_dir: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Analyze frames while they are still being decoded.
+
+        Args:
+            frame_queue: Queue of BGR frames in playback order, terminated by None
+            source_size: (width, height) of the video before any downscaling; keypoints
+                are mapped back to it so scores do not depend on the analysis size
+            work_dir: Directory for the landmarks file (default settings.temp_dir); the caller removes it
+
+        Returns:
+            Dictionary containing enhanced pose analysis results
+        """
+        first_frame = frame_queue.get()
+        if first_frame is None:
+            raise PoseDetectionError("No frames were received for analysis.")
+
+        frame_scale = None
+        if source_size is not None:
+            height, width = first_frame.shape[:2]
+            frame_scale = self._frame_scale(source_size, (width, height))
+
+        frame_count = 1
+
+        def _drain_queue() -> Iterator[Tuple[int, np.ndarray]]:
+            nonlocal frame_count
+            yield 0, first_frame
+            while (frame := frame_queue.get()) is not None:
+                frame_count += 1
+                yield frame_count - 1, frame
+
+        pose_frames, detected_frames_count = self._detect_frame_batches(
+            self._batch_frames(_drain_queue()), frame_scale=frame_scale
+        )
+
+        return self.analyze_detections(pose_frames, detected_frames_count, frame_count, work_dir)
+
+    def _analyze_frame_batches(self, batches: Iterator[Tuple[List[int], Union[List[np.ndarray], torch.Tensor]]],
+                               frame_count: int, frame_scale: Optional[np.ndarray] = None,
+                               work_dir: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Run detection, interpolation, smoothing and scoring over batches of frames.
 
         Args:
-            frames_dir: Path to directory containing video frames
+            batches: Iterator of (frame_indices, images) batches
+            frame_count: Total number of frames in the sequence
+            frame_scale: Per-axis factor from frame pixels to source pixels, if frames were downscaled
+            work_dir: Directory for the landmarks file (default settings.temp_dir); the caller removes it
 
         Returns:
             Dictionary containing enhanced pose analysis results
         """
-        if not frames_dir.is_dir():
-            raise PoseDetectionError(f"Frames directory not found: {frames_dir}")
+        pose_frames, detected_frames_count = self._detect_frame_batches(batches, frame_count, frame_scale)
+        return self.analyze_detections(pose_frames, detected_frames_count, frame_count, work_dir)
+
+    def _detect_frame_batches(self, batches: Iterator[Tuple[List[int], Union[List[np.ndarray], torch.Tensor]]],
+                              frame_count: Optional[int] = None,
+                              frame_scale: Optional[np.ndarray] = None) -> Tuple[List[PoseFrame], int]:
+        """
+        Detect poses in batches of frames.
+        When the total frame count is known, detection stops as soon as the
+        remaining frames can no longer reach settings.analysis_min_frames.
 
-        image_files = sorted(list(frames_dir.glob("*.jpg")) + list(frames_dir.glob("*.png")))
-        if not image_files:
-            raise PoseDetectionError(f"No image files found in frames directory: {frames_dir}")
+        Args:
+            batches: Iterator of (frame_indices, images) batches
+            frame_count: Total number of frames in the sequence, if known
+            frame_scale: Per-axis factor from frame pixels to source pixels, if frames were downscaled
 
+        Returns:
+            Tuple of (pose_frames, detected_frames_count)
+        """
         # Detect poses in all frames
         pose_frames = []
         detected_frames_count = 0
+        pending = deque()
 
         # Increased temporal granularity - process at higher rate
         frame_rate = settings.frame_extraction_fps * 10  # 10x temporal granularity
 
-        for i, img_file in enumerate(image_files):
-            image = cv2.imread(str(img_file))
-            if image is None:
-                print(f"Warning: Could not read image {img_file}. Skipping.")
-                continue
+        def _collect(batch_poses: List[PoseFrame]):
+            nonlocal detected_frames_count
+            # Check if pose was detected
+            detected_frames_count += sum(1 for pose_frame in batch_poses if len(pose_frame.body_conf) > 0)
+            pose_frames.extend(batch_poses)
+
+            # Give up early once even a detection in every remaining frame would not suffice
+            if frame_count is not None and batch_poses:
+                remaining = frame_count - (batch_poses[-1].frame_idx + 1)
+                if detected_frames_count + remaining < settings.analysis_min_frames:
+                    for future in pending:
+                        future.cancel()
+                    raise self._too_few_detections_error(detected_frames_count, frame_count)
+
+        # Run batches on pooled detectors, keeping a bounded number in flight
+        with ThreadPoolExecutor(max_workers=self._pool_size) as executor:
+            for batch_indices, batch_images in batches:
+                # Calculate timestamps with higher granularity
+                batch_timestamps = (np.asarray(batch_indices) / frame_rate).tolist()
+
+                pending.append(executor.submit(
+                    self._detect_batch, batch_images, batch_indices, batch_timestamps, frame_scale
+                ))
+                if len(pending) >= 2 * self._pool_size:
+                    _collect(pending.popleft().result())
+
+            while pending:
+                _collect(pending.popleft().result())
+
+        return pose_frames, detected_frames_count
+
+    def _detect_batch(self, images: Union[List[np.ndarray], torch.Tensor], frame_indices: List[int],
+                      timestamps: List[float], frame_scale: Optional[np.ndarray] = None) -> List[PoseFrame]:
+        """
+        Detect poses for one batch of frames on a pooled detector.
+        Keypoints of downscaled frames are mapped back to source pixels, so
+        scores, cached detections and exported landmarks match a full-size run.
+        """
+        with self._borrow_detector() as detector:
+            poses = detector.detect_pose_batch(images, frame_indices, timestamps)
+
+        if frame_scale is not None:
+            poses = [
+                replace(pose, **{
+                    f"{name}_xy": getattr(pose, f"{name}_xy") * frame_scale
+                    for name, _ in LANDMARK_GROUPS
+                })
+                for pose in poses
+            ]
+        return poses
 
-            # Convert BGR to RGB for processing
-            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    @staticmethod
+    def _frame_scale(source_size: Tuple[int, int], frame_size: Tuple[int, int]) -> Optional[np.ndarray]:
+        """
+        Per-axis factor that maps keypoints from analyzed-frame pixels back to source pixels.
 
-            # Calculate timestamp with higher granularity
-            timestamp = i / frame_rate
+        Args:
+            source_size: (width, height) of the video
+            frame_size: (width, height) of the frames passed to the pose model
 
-            # Detect pose
-            pose_frame = self.detector.detect_pose_frame(image_rgb, i, timestamp)
+        Returns:
+            float32 [x_scale, y_scale], or None when frames were not resized
+        """
+        if tuple(source_size) == tuple(frame_size):
+            return None
+        return np.array([source_size[0] / frame_size[0], source_size[1] / frame_size[1]], dtype=np.float32)
 
-            # Check if pose was detected
-            if pose_frame.body_keypoints:
-                detected_frames_count += 1
+    def analyze_detections(self, pose_frames: List[PoseFrame], detected_frames_count: int,
+                           frame_count: int, work_dir: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Interpolate, smooth and score detected poses.
+        The raw detections are kept in last_detections so callers can cache them.
+        No pose model is loaded, so replaying cached detections stays cheap.
 
-            pose_frames.append(pose_frame)
+        Args:
+            pose_frames: Detected pose frames
+            detected_frames_count: Number of frames with a detected pose
+            frame_count: Total number of frames in the sequence
+            work_dir: Directory for the landmarks file (default settings.temp_dir); the caller removes it
 
+        Returns:
+            Dictionary containing enhanced pose analysis results
+        """
         if detected_frames_count < settings.analysis_min_frames:
-            raise PoseDetectionError(
-                f"Too few frames with detected poses ({detected_frames_count}/{len(image_files)}). "
-                f"Minimum required: {settings.analysis_min_frames}. "
-                "Ensure the video clearly shows a person and try adjusting confidence threshold."
-            )
+            raise self._too_few_detections_error(detected_frames_count, frame_count)
+
+        self.last_detections = (pose_frames, detected_frames_count, frame_count)
 
         # Apply temporal interpolation for smooth motion
-        interpolated_poses = self.detector.interpolate_poses(pose_frames)
+        interpolated_poses = OpenPoseDetector.interpolate_poses(pose_frames)
 
         # Apply smoothing to reduce jitter
-        smoothed_poses = self.detector.smooth_poses(interpolated_poses)
+        smoothed_poses = OpenPoseDetector.smooth_poses(interpolated_poses)
+
+        # Write landmarks as a compact binary array for the viewer
+        landmarks_bin_path = self._write_landmarks(
+            smoothed_poses, settings.frame_extraction_fps * OpenPoseDetector.INTERPOLATION_FACTOR, work_dir
+        )
 
         # Generate stick figure representation
         stick_figure_data = self._generate_stick_figure_data(smoothed_poses)
 
         # Calculate enhanced metrics
         overall_scores = self._calculate_enhanced_scores(smoothed_poses)
-        detection_rate = detected_frames_count / len(image_files)
+        detection_rate = detected_frames_count / frame_count
 
-        return {
-            "pose_frames": [self._pose_frame_to_dict(frame) for frame in smoothed_poses],
+        results = {
+            "landmarks_bin_path": landmarks_bin_path,
             "stick_figure_data": stick_figure_data,
             "overall_scores": overall_scores,
             "detection_rate": detection_rate,
-            "frame_count": len(image_files),
+            "frame_count": frame_count,
             "interpolated_frame_count": len(smoothed_poses),
             "detected_frames_count": detected_frames_count,
             "temporal_granularity": 10,  # 10x improvement
             "features": {
                 "full_body_detection": True,
-                "hand_detection": True,
+                "hand_detection": False,
                 "face_detection": True,
                 "motion_interpolation": True,
                 "temporal_smoothing": True
             }
         }
 
+        # Per-keypoint dicts duplicate the landmarks file; only build them when asked for
+        if settings.analysis_legacy_json:
+            results["pose_frames"] = [self._pose_frame_to_dict(frame) for frame in smoothed_poses]
+
+        return results
+
+    @staticmethod
+    def _too_few_detections_error(detected_frames_count: int, frame_count: int) -> PoseDetectionError:
+        """Build the error raised when too few frames contain a detected pose."""
+        return PoseDetectionError(
+            f"Too few frames with detected poses ({detected_frames_count}/{frame_count}). "
+            f"Minimum required: {settings.analysis_min_frames}. "
+            "Ensure the video clearly shows a person and try adjusting confidence threshold."
+        )
+
+    @staticmethod
+    def _batch_frames(frames: Iterable[Tuple[int, np.ndarray]]) -> Iterator[Tuple[List[int], List[np.ndarray]]]:
+        """
+        Group frames into inference batches.
+
+        Args:
+            frames: (frame_index, bgr_image) pairs in playback order
+
+        Yields:
+            Tuples of (frame_indices, bgr_images) with at most settings.batch_size entries
+        """
+        batch_size = max(1, settings.batch_size)
+        batch_indices: List[int] = []
+        batch_images: List[np.ndarray] = []
+
+        for i, image in frames:
+            batch_indices.append(i)
+            batch_images.append(image)
+
+            if len(batch_images) == batch_size:
+                yield batch_indices, batch_images
+                batch_indices, batch_images = [], []
+
+        if batch_images:
+            yield batch_indices, batch_images
+
     def _pose_frame_to_dict(self, pose_frame: PoseFrame) -> Dict[str, Any]:
         """Convert PoseFrame to dictionary format."""
         return {
             "timestamp": pose_frame.timestamp,
             "frame_idx": pose_frame.frame_idx,
             "body_keypoints": [
-                {"x": kp.x, "y": kp.y, "confidence": kp.confidence, "z": kp.z}
-                for kp in pose_frame.body_keypoints
+                {"x": kp.x, "y": kp.y, "confidence": kp.confidence}
+                for kp in pose_frame.keypoints("body")
             ],
             "hand_keypoints_left": [
-                {"x": kp.x, "y": kp.y, "confidence": kp.confidence, "z": kp.z}
-                for kp in pose_frame.hand_keypoints_left
+                {"x": kp.x, "y": kp.y, "confidence": kp.confidence}
+                for kp in pose_frame.keypoints("hand_left")
             ],
             "hand_keypoints_right": [
-                {"x": kp.x, "y": kp.y, "confidence": kp.confidence, "z": kp.z}
-                for kp in pose_frame.hand_keypoints_right
+                {"x": kp.x, "y": kp.y, "confidence": kp.confidence}
+                for kp in pose_frame.keypoints("hand_right")
             ],
             "face_keypoints": [
-                {"x": kp.x, "y": kp.y, "confidence": kp.confidence, "z": kp.z}
-                for kp in pose_frame.face_keypoints
+                {"x": kp.x, "y": kp.y, "confidence": kp.confidence}
+                for kp in pose_frame.keypoints("face")
             ]
         }
 
+    def _write_landmarks(self, poses: List[PoseFrame], fps: float, work_dir: Optional[Path] = None) -> Path:
+        """
+        Write all keypoints as a float16 (frames, keypoints, [x, y, confidence]) array.
+        A JSON sidecar next to it records the shape, dtype, frame rate and groups.
+        Frames are converted in chunks straight into a memory-mapped file, so memory
+        use does not grow with video length.
+
+        Args:
+            poses: List of pose frames
+            fps: Frame rate of the pose sequence
+            work_dir: Directory to write into (default settings.temp_dir)
+
+        Returns:
+            Path to the binary landmarks file
+        """
+        groups = {}
+        offset = 0
+        for name, num_keypoints in LANDMARK_GROUPS:
+            groups[name] = [offset, offset + num_keypoints]
+            offset += num_keypoints
+        shape = (len(poses), offset, 3)
+
+        work_dir = work_dir or settings.temp_dir
+        work_dir.mkdir(parents=True, exist_ok=True)
+        # Unique name, so concurrent analyses never overwrite each other's landmarks
+        fd, landmarks_bin_name = tempfile.mkstemp(prefix="landmarks_", suffix=".f16", dir=work_dir)
+        os.close(fd)
+        landmarks_bin_path = Path(landmarks_bin_name)
+        if poses:
+            landmarks = np.memmap(landmarks_bin_path, dtype="<f2", mode="w+", shape=shape)
+            for start in range(0, len(poses), LANDMARK_WRITE_CHUNK):
+                chunk = poses[start:start + LANDMARK_WRITE_CHUNK]
+                rows = slice(start, start + len(chunk))
+                for name, num_keypoints in LANDMARK_GROUPS:
+                    begin, end = groups[name]
+                    xy, conf = stack_keypoints(chunk, name, num_keypoints)
+                    landmarks[rows, begin:end, :2] = xy
+                    landmarks[rows, begin:end, 2] = conf
+            landmarks.flush()
+            del landmarks
+        else:
+            # np.memmap cannot map an empty file
+            landmarks_bin_path.write_bytes(b"")
+
+        with open(landmarks_bin_path.with_suffix(".json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "shape": list(shape),
+                "dtype": "float16",
+                "fps": fps,
+                "channels": ["x", "y", "confidence"],
+                "groups": groups
+            }, f)
+
+        return landmarks_bin_path
+
     def _generate_stick_figure_data(self, poses: List[PoseFrame]) -> Dict[str, Any]:
         """
         Generate stick figure representation data with connections.
+        Each keypoint group is stacked once and its connections are masked for all
+        frames at once; dictionaries are only built for the visible connections.
 
         Args:
             poses: List of pose frames
@@ -522,10 +1119,8 @@ class PoseAnalyzer:
         Returns:
             Dictionary containing stick figure data
         """
-        stick_figure_frames = []
-
-        for pose in poses:
-            frame_data = {
+        stick_figure_frames = [
+            {
                 "timestamp": pose.timestamp,
                 "frame_idx": pose.frame_idx,
                 "body_connections": [],
@@ -533,53 +1128,33 @@ class PoseAnalyzer:
                 "hand_connections_right": [],
                 "face_connections": []
             }
+            for pose in poses
+        ]
+
+        for key, group, num_keypoints, connections in (
+            ("body_connections", "body", 17, OpenPoseDetector.BODY_CONNECTION_INDICES),
+            ("hand_connections_left", "hand_left", 21, OpenPoseDetector.HAND_CONNECTION_INDICES),
+            ("hand_connections_right", "hand_right", 21, OpenPoseDetector.HAND_CONNECTION_INDICES),
+        ):
+            xy, conf = stack_keypoints(poses, group, num_keypoints)
+
+            # Both ends of a connection must be confidently detected
+            start_conf = conf[:, connections[:, 0]]
+            end_conf = conf[:, connections[:, 1]]
+            frame_idx, connection_idx = np.nonzero((start_conf > 0.3) & (end_conf > 0.3))
+            if frame_idx.size == 0:
+                continue
+
+            starts = xy[frame_idx, connections[connection_idx, 0]].tolist()
+            ends = xy[frame_idx, connections[connection_idx, 1]].tolist()
+            confidences = np.minimum(start_conf, end_conf)[frame_idx, connection_idx].tolist()
 
-            # Body connections
-            for connection in OpenPoseDetector.BODY_CONNECTIONS:
-                if (connection[0] < len(pose.body_keypoints) and
-                    connection[1] < len(pose.body_keypoints)):
-
-                    kp1 = pose.body_keypoints[connection[0]]
-                    kp2 = pose.body_keypoints[connection[1]]
-
-                    if kp1.confidence > 0.3 and kp2.confidence > 0.3:
-                        frame_data["body_connections"].append({
-                            "from": {"x": kp1.x, "y": kp1.y},
-                            "to": {"x": kp2.x, "y": kp2.y},
-                            "confidence": min(kp1.confidence, kp2.confidence)
-                        })
-
-            # Hand connections (left)
-            for connection in OpenPoseDetector.HAND_CONNECTIONS:
-                if (connection[0] < len(pose.hand_keypoints_left) and
-                    connection[1] < len(pose.hand_keypoints_left)):
-
-                    kp1 = pose.hand_keypoints_left[connection[0]]
-                    kp2 = pose.hand_keypoints_left[connection[1]]
-
-                    if kp1.confidence > 0.3 and kp2.confidence > 0.3:
-                        frame_data["hand_connections_left"].append({
-                            "from": {"x": kp1.x, "y": kp1.y},
-                            "to": {"x": kp2.x, "y": kp2.y},
-                            "confidence": min(kp1.confidence, kp2.confidence)
-                        })
-
-            # Hand connections (right)
-            for connection in OpenPoseDetector.HAND_CONNECTIONS:
-                if (connection[0] < len(pose.hand_keypoints_right) and
-                    connection[1] < len(pose.hand_keypoints_right)):
-
-                    kp1 = pose.hand_keypoints_right[connection[0]]
-                    kp2 = pose.hand_keypoints_right[connection[1]]
-
-                    if kp1.confidence > 0.3 and kp2.confidence > 0.3:
-                        frame_data["hand_connections_right"].append({
-                            "from": {"x": kp1.x, "y": kp1.y},
-                            "to": {"x": kp2.x, "y": kp2.y},
-                            "confidence": min(kp1.confidence, kp2.confidence)
-                        })
-
-            stick_figure_frames.append(frame_data)
+            for t, (x1, y1), (x2, y2), confidence in zip(frame_idx.tolist(), starts, ends, confidences):
+                stick_figure_frames[t][key].append({
+                    "from": {"x": x1, "y": y1},
+                    "to": {"x": x2, "y": y2},
+                    "confidence": confidence
+                })
 
         return {
             "frames": stick_figure_frames,
@@ -606,14 +1181,21 @@ class PoseAnalyzer:
         if not poses:
             return {"flow": 0.0, "balance": 0.0, "smoothness": 0.0, "energy": 0.0}
 
-        # Calculate motion smoothness
-        smoothness_score = self._calculate_motion_smoothness(poses)
+        # Stack body keypoints once into contiguous (T, K, 2) / (T, K) arrays
+        body_xy, body_conf = stack_keypoints(poses, "body", len(OpenPoseDetector.BODY_KEYPOINTS))
 
-        # Calculate balance score
-        balance_score = self._calculate_balance_score(poses)
+        if body_motion_metrics is not None:
+            # Smoothness, balance and energy in one compiled pass
+            smoothness_score, balance_score, energy_score = body_motion_metrics(body_xy, body_conf, 0.3)
+        else:
+            # Calculate motion smoothness
+            smoothness_score = self._calculate_motion_smoothness(body_xy, body_conf)
 
-        # Calculate energy/activity score
-        energy_score = self._calculate_energy_score(poses)
+            # Calculate balance score
+            balance_score = self._calculate_balance_score(body_xy, body_conf)
+
+            # Calculate energy/activity score
+            energy_score = self._calculate_energy_score(body_xy, body_conf)
 
         # Calculate overall flow score
         flow_score = (smoothness_score + balance_score + energy_score) / 3.0
@@ -624,115 +1206,60 @@ class PoseAnalyzer:
             "smoothness": min(100.0, smoothness_score),
             "energy": min(100.0, energy_score),
             "hand_activity": self._calculate_hand_activity(poses),
-            "posture_stability": self._calculate_posture_stability(poses)
+            "posture_stability": self._calculate_posture_stability(body_xy, body_conf)
         }
 
-    def _calculate_motion_smoothness(self, poses: List[PoseFrame]) -> float:
-        """Calculate motion smoothness score."""
-        if len(poses) < 2:
+    def _calculate_motion_smoothness(self, xy: np.ndarray, conf: np.ndarray) -> float:
+        """Calculate motion smoothness score from (T, K, 2) keypoints."""
+        if len(xy) < 2:
             return 0.0
 
-        # Calculate velocity changes for body keypoints
-        velocity_changes = []
-
-        for i in range(1, len(poses) - 1):
-            prev_pose = poses[i - 1]
-            curr_pose = poses[i]
-            next_pose = poses[i + 1]
-
-            # Calculate velocity change for each keypoint
-            for j in range(min(len(prev_pose.body_keypoints), len(curr_pose.body_keypoints), len(next_pose.body_keypoints))):
-                if (prev_pose.body_keypoints[j].confidence > 0.3 and
-                    curr_pose.body_keypoints[j].confidence > 0.3 and
-                    next_pose.body_keypoints[j].confidence > 0.3):
-
-                    # Calculate acceleration (change in velocity)
-                    vel1_x = curr_pose.body_keypoints[j].x - prev_pose.body_keypoints[j].x
-                    vel1_y = curr_pose.body_keypoints[j].y - prev_pose.body_keypoints[j].y
-
-                    vel2_x = next_pose.body_keypoints[j].x - curr_pose.body_keypoints[j].x
-                    vel2_y = next_pose.body_keypoints[j].y - curr_pose.body_keypoints[j].y
+        # Acceleration (change in velocity) of keypoints confident in all three frames
+        accel_magnitude = np.linalg.norm(np.diff(xy, n=2, axis=0), axis=-1)
+        valid = (conf[:-2] > 0.3) & (conf[1:-1] > 0.3) & (conf[2:] > 0.3)
+        velocity_changes = accel_magnitude[valid]
 
-                    accel_x = vel2_x - vel1_x
-                    accel_y = vel2_y - vel1_y
-
-                    accel_magnitude = np.sqrt(accel_x**2 + accel_y**2)
-                    velocity_changes.append(accel_magnitude)
-
-        if not velocity_changes:
+        if velocity_changes.size == 0:
             return 0.0
 
         # Lower acceleration variance indicates smoother motion
         smoothness = max(0.0, 100.0 - np.std(velocity_changes) * 10)
         return smoothness
 
-    def _calculate_balance_score(self, poses: List[PoseFrame]) -> float:
-        """Calculate balance score based on body stability."""
-        if not poses:
+    def _calculate_balance_score(self, xy: np.ndarray, conf: np.ndarray) -> float:
+        """Calculate balance score based on body stability from (T, K, 2) keypoints."""
+        if len(xy) == 0:
             return 0.0
 
-        balance_scores = []
-
-        for pose in poses:
-            if len(pose.body_keypoints) >= 17:
-                # Calculate center of mass
-                left_hip = pose.body_keypoints[11]
-                right_hip = pose.body_keypoints[12]
-                left_ankle = pose.body_keypoints[15]
-                right_ankle = pose.body_keypoints[16]
-
-                if (left_hip.confidence > 0.3 and right_hip.confidence > 0.3 and
-                    left_ankle.confidence > 0.3 and right_ankle.confidence > 0.3):
-
-                    # Center of mass (simplified)
-                    com_x = (left_hip.x + right_hip.x) / 2
-                    com_y = (left_hip.y + right_hip.y) / 2
-
-                    # Base of support
-                    base_x = (left_ankle.x + right_ankle.x) / 2
-                    base_y = (left_ankle.y + right_ankle.y) / 2
-
-                    # Balance score based on COM-BOS distance
-                    distance = np.sqrt((com_x - base_x)**2 + (com_y - base_y)**2)
-                    balance = max(0.0, 100.0 - distance * 0.5)
-                    balance_scores.append(balance)
-
-        return np.mean(balance_scores) if balance_scores else 0.0
-
-    def _calculate_energy_score(self, poses: List[PoseFrame]) -> float:
-        """Calculate energy/activity score."""
-        if len(poses) < 2:
+        # Frames where both hips (11, 12) and both ankles (15, 16) are confident
+        valid = (conf[:, [11, 12, 15, 16]] > 0.3).all(axis=1)
+        if not valid.any():
             return 0.0
 
-        total_movement = 0.0
-        frame_count = 0
-
-        for i in range(1, len(poses)):
-            prev_pose = poses[i - 1]
-            curr_pose = poses[i]
+        # Center of mass (simplified) and base of support
+        com = xy[valid][:, [11, 12]].mean(axis=1)
+        base = xy[valid][:, [15, 16]].mean(axis=1)
 
-            frame_movement = 0.0
-            keypoint_count = 0
+        # Balance score based on COM-BOS distance
+        distance = np.linalg.norm(com - base, axis=-1)
+        return np.mean(np.maximum(0.0, 100.0 - distance * 0.5))
 
-            for j in range(min(len(prev_pose.body_keypoints), len(curr_pose.body_keypoints))):
-                if (prev_pose.body_keypoints[j].confidence > 0.3 and
-                    curr_pose.body_keypoints[j].confidence > 0.3):
-
-                    dx = curr_pose.body_keypoints[j].x - prev_pose.body_keypoints[j].x
-                    dy = curr_pose.body_keypoints[j].y - prev_pose.body_keypoints[j].y
-
-                    movement = np.sqrt(dx**2 + dy**2)
-                    frame_movement += movement
-                    keypoint_count += 1
+    def _calculate_energy_score(self, xy: np.ndarray, conf: np.ndarray) -> float:
+        """Calculate energy/activity score from (T, K, 2) keypoints."""
+        if len(xy) < 2:
+            return 0.0
 
-            if keypoint_count > 0:
-                total_movement += frame_movement / keypoint_count
-                frame_count += 1
+        # Per-frame mean displacement of keypoints confident in both frames
+        movement = np.linalg.norm(np.diff(xy, axis=0), axis=-1)
+        valid = (conf[:-1] > 0.3) & (conf[1:] > 0.3)
+        keypoint_count = valid.sum(axis=1)
+        moving_frames = keypoint_count > 0
 
-        if frame_count == 0:
+        if not moving_frames.any():
             return 0.0
 
-        average_movement = total_movement / frame_count
+        frame_movement = np.where(valid, movement, 0.0).sum(axis=1)
+        average_movement = np.mean(frame_movement[moving_frames] / keypoint_count[moving_frames])
         energy_score = min(100.0, average_movement * 2.0)  # Scale factor
 
         return energy_score
@@ -744,85 +1271,47 @@ class PoseAnalyzer:
 
         hand_movements = []
 
-        for i in range(1, len(poses)):
-            prev_pose = poses[i - 1]
-            curr_pose = poses[i]
+        for group in ("hand_left", "hand_right"):
+            xy, conf = stack_keypoints(poses, group, len(OpenPoseDetector.HAND_KEYPOINTS))
 
-            # Left hand movement
-            if (prev_pose.hand_keypoints_left and curr_pose.hand_keypoints_left):
-                for j in range(min(len(prev_pose.hand_keypoints_left), len(curr_pose.hand_keypoints_left))):
-                    if (prev_pose.hand_keypoints_left[j].confidence > 0.3 and
-                        curr_pose.hand_keypoints_left[j].confidence > 0.3):
+            # Movement of hand keypoints confident in consecutive frames
+            movement = np.linalg.norm(np.diff(xy, axis=0), axis=-1)
+            valid = (conf[:-1] > 0.3) & (conf[1:] > 0.3)
+            hand_movements.append(movement[valid])
 
-                        dx = curr_pose.hand_keypoints_left[j].x - prev_pose.hand_keypoints_left[j].x
-                        dy = curr_pose.hand_keypoints_left[j].y - prev_pose.hand_keypoints_left[j].y
-
-                        movement = np.sqrt(dx**2 + dy**2)
-                        hand_movements.append(movement)
-
-            # Right hand movement
-            if (prev_pose.hand_keypoints_right and curr_pose.hand_keypoints_right):
-                for j in range(min(len(prev_pose.hand_keypoints_right), len(curr_pose.hand_keypoints_right))):
-                    if (prev_pose.hand_keypoints_right[j].confidence > 0.3 and
-                        curr_pose.hand_keypoints_right[j].confidence > 0.3):
-
-                        dx = curr_pose.hand_keypoints_right[j].x - prev_pose.hand_keypoints_right[j].x
-                        dy = curr_pose.hand_keypoints_right[j].y - prev_pose.hand_keypoints_right[j].y
-
-                        movement = np.sqrt(dx**2 + dy**2)
-                        hand_movements.append(movement)
-
-        if not hand_movements:
+        hand_movements = np.concatenate(hand_movements)
+        if hand_movements.size == 0:
             return 0.0
 
         return min(100.0, np.mean(hand_movements) * 5.0)
 
-    def _calculate_posture_stability(self, poses: List[PoseFrame]) -> float:
-        """Calculate posture stability score."""
-        if not poses:
+    def _calculate_posture_stability(self, xy: np.ndarray, conf: np.ndarray) -> float:
+        """Calculate posture stability score from (T, K, 2) body keypoints."""
+        if len(xy) == 0:
             return 0.0
 
-        posture_scores = []
-
-        for pose in poses:
-            if len(pose.body_keypoints) >= 17:
-                # Calculate spine alignment
-                nose = pose.body_keypoints[0]
-                left_shoulder = pose.body_keypoints[5]
-                right_shoulder = pose.body_keypoints[6]
-                left_hip = pose.body_keypoints[11]
-                right_hip = pose.body_keypoints[12]
-
-                if (nose.confidence > 0.3 and left_shoulder.confidence > 0.3 and
-                    right_shoulder.confidence > 0.3 and left_hip.confidence > 0.3 and
-                    right_hip.confidence > 0.3):
-
-                    # Calculate shoulder and hip alignment
-                    shoulder_center_x = (left_shoulder.x + right_shoulder.x) / 2
-                    shoulder_center_y = (left_shoulder.y + right_shoulder.y) / 2
-
-                    hip_center_x = (left_hip.x + right_hip.x) / 2
-                    hip_center_y = (left_hip.y + right_hip.y) / 2
-
-                    # Calculate spine deviation
-                    spine_deviation = abs(shoulder_center_x - hip_center_x)
+        # Frames where the nose (0), shoulders (5, 6) and hips (11, 12) are confident
+        valid = (conf[:, [0, 5, 6, 11, 12]] > 0.3).all(axis=1)
+        if not valid.any():
+            return 0.0
 
-                    # Calculate posture score
-                    posture_score = max(0.0, 100.0 - spine_deviation * 0.5)
-                    posture_scores.append(posture_score)
+        # Calculate shoulder and hip alignment
+        shoulder_center_x = xy[valid][:, [5, 6], 0].mean(axis=1)
+        hip_center_x = xy[valid][:, [11, 12], 0].mean(axis=1)
 
-        return np.mean(posture_scores) if posture_scores else 0.0
+        # Spine deviation and posture score
+        spine_deviation = np.abs(shoulder_center_x - hip_center_x)
+        return np.mean(np.maximum(0.0, 100.0 - spine_deviation * 0.5))
 
     def close(self):
-        """Release resources."""
-        if hasattr(self, '_closed') and self._closed:
+        """Release resources held by the pooled detectors."""
+        if self._closed:
             return
 
-        if hasattr(self, 'detector'):
-            self.detector.close()
+        with self._pool_lock:
+            for detector in self._detectors:
+                detector.close()
+            self._detectors.clear()
+            self._pool = queue.Queue()
 
         self._closed = True
-
-    def __del__(self):
-        """Cleanup on deletion."""
-        self.close()
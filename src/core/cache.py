@@ -0,0 +1,198 @@
+"""
+Analysis cache module.
+Persists pose detections on disk so re-running the same video skips download and detection.
+"""
+
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+from dataclasses import dataclass
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.analyzer import PoseFrame, LANDMARK_GROUPS, POSE_MODEL_WEIGHTS, stack_keypoints
+
+# Bytes hashed from each end of a local video to identify it
+FILE_ID_SAMPLE_SIZE = 1 << 20
+# Evenly spaced windows hashed between the ends, so edits inside the stream change the id
+FILE_ID_INTERIOR_SAMPLES = 16
+FILE_ID_INTERIOR_SAMPLE_SIZE = 64 << 10
+
+# Video metadata used by the viewer and publisher; the rest of the yt-dlp info is not cached
+CACHED_VIDEO_INFO_KEYS = ('id', 'title', 'uploader', 'upload_date', 'thumbnail', 'webpage_url', 'duration')
+
+
+@dataclass
+class CachedDetections:
+    """Raw pose detections of one video, before interpolation and smoothing."""
+    pose_frames: List[PoseFrame]
+    detected_frames_count: int
+    frame_count: int
+    video_info: Dict[str, Any]
+
+
+class AnalysisCache:
+    """
+    Content-addressed store of pose detections.
+    Keys combine the video identity with every setting that changes detection output.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir or settings.cache_dir
+
+    @staticmethod
+    def make_key(video_id: str) -> str:
+        """
+        Build the cache key for a video under the current detection settings.
+
+        Args:
+            video_id: YouTube video ID or local file digest
+
+        Returns:
+            Hex digest identifying the cache entry
+        """
+        key_source = "|".join(str(part) for part in (
+            video_id,
+            POSE_MODEL_WEIGHTS,
+            settings.frame_extraction_fps,
+            settings.pose_confidence_threshold,
+            settings.analysis_frame_size,
+            # TensorRT engines (FP16, or INT8 with its calibration) give different detections
+            settings.use_tensorrt,
+            settings.tensorrt_precision,
+            settings.tensorrt_calibration_data,
+            settings.tensorrt_int8_max_error
+        ))
+        return hashlib.blake2b(key_source.encode(), digest_size=8).hexdigest()
+
+    @staticmethod
+    def file_video_id(video_path: Path) -> str:
+        """
+        Identify a local video by its size and a digest of its first and last megabyte
+        plus evenly spaced interior windows; small files are hashed whole.
+        Sampling keeps the lookup cheap for multi-GB files, and unlike a path and
+        mtime key it still matches a copy of the same video.
+
+        Accepted collision: an in-place edit that keeps the byte size and touches
+        only bytes between the sampled windows maps to the old entry. Re-encodes and
+        re-exports rewrite the stream throughout, so they change the id.
+
+        Args:
+            video_path: Path to the video file
+
+        Returns:
+            Video identifier for make_key
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(video_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            interior = size - 2 * FILE_ID_SAMPLE_SIZE
+            if interior <= FILE_ID_INTERIOR_SAMPLES * FILE_ID_INTERIOR_SAMPLE_SIZE:
+                for chunk in iter(lambda: f.read(FILE_ID_SAMPLE_SIZE), b""):
+                    digest.update(chunk)
+            else:
+                digest.update(f.read(FILE_ID_SAMPLE_SIZE))
+                spacing = (interior - FILE_ID_INTERIOR_SAMPLE_SIZE) // (FILE_ID_INTERIOR_SAMPLES - 1)
+                for i in range(FILE_ID_INTERIOR_SAMPLES):
+                    f.seek(FILE_ID_SAMPLE_SIZE + i * spacing)
+                    digest.update(f.read(FILE_ID_INTERIOR_SAMPLE_SIZE))
+                f.seek(-FILE_ID_SAMPLE_SIZE, os.SEEK_END)
+                digest.update(f.read(FILE_ID_SAMPLE_SIZE))
+        return f"file:{size}:{digest.hexdigest()}"
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"pose_{key}.npz"
+
+    def load(self, key: str) -> Optional[CachedDetections]:
+        """
+        Load cached detections if a fresh entry exists.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached detections, or None on a miss
+        """
+        entry_path = self._entry_path(key)
+        if not settings.cache_enabled or not entry_path.is_file():
+            return None
+
+        if time.time() - entry_path.stat().st_mtime > settings.cache_ttl:
+            return None
+
+        try:
+            with np.load(entry_path, allow_pickle=False) as entry:
+                keypoints = entry["keypoints"]
+                counts = entry["counts"]
+                timestamps = entry["timestamps"]
+                frame_indices = entry["frame_indices"]
+                meta = json.loads(str(entry["meta"]))
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable analysis cache entry {entry_path}: {e}")
+            return None
+
+        keypoints = keypoints.astype(np.float32)
+        pose_frames = []
+        for t in range(len(keypoints)):
+            groups = {}
+            offset = 0
+            for g, (name, num_keypoints) in enumerate(LANDMARK_GROUPS):
+                group_keypoints = keypoints[t, offset:offset + counts[t, g]]
+                groups[f"{name}_xy"] = group_keypoints[:, :2]
+                groups[f"{name}_conf"] = group_keypoints[:, 2]
+                offset += num_keypoints
+            pose_frames.append(PoseFrame(
+                timestamp=float(timestamps[t]),
+                frame_idx=int(frame_indices[t]),
+                **groups
+            ))
+
+        return CachedDetections(
+            pose_frames=pose_frames,
+            detected_frames_count=meta["detected_frames_count"],
+            frame_count=meta["frame_count"],
+            video_info=meta["video_info"]
+        )
+
+    def save(self, key: str, detections: CachedDetections):
+        """
+        Store detections under the given key.
+
+        Args:
+            key: Cache key from make_key
+            detections: Detections to store
+        """
+        if not settings.cache_enabled:
+            return
+
+        poses = detections.pose_frames
+        arrays = []
+        counts = np.zeros((len(poses), len(LANDMARK_GROUPS)), dtype=np.int16)
+        for g, (name, num_keypoints) in enumerate(LANDMARK_GROUPS):
+            xy, conf = stack_keypoints(poses, name, num_keypoints)
+            arrays.append(np.concatenate([xy, conf[..., np.newaxis]], axis=-1))
+            counts[:, g] = [min(len(getattr(pose, f"{name}_conf")), num_keypoints) for pose in poses]
+
+        meta = {
+            "detected_frames_count": detections.detected_frames_count,
+            "frame_count": detections.frame_count,
+            "video_info": {k: detections.video_info.get(k) for k in CACHED_VIDEO_INFO_KEYS}
+        }
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(key)
+        # Write to a temporary file first so an interrupted run never leaves a partial entry
+        tmp_path = entry_path.with_suffix(".tmp.npz")
+        np.savez_compressed(
+            tmp_path,
+            keypoints=np.concatenate(arrays, axis=1),
+            counts=counts,
+            timestamps=np.array([pose.timestamp for pose in poses], dtype=np.float64),
+            frame_indices=np.array([pose.frame_idx for pose in poses], dtype=np.int64),
+            meta=np.array(json.dumps(meta))
+        )
+        tmp_path.replace(entry_path)
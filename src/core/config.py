@@ -5,8 +5,8 @@ Uses pydantic for validation and environment variable support.
 
 from pathlib import Path
 from typing import Optional, Literal
-from pydantic import validator
-from pydantic_settings import BaseSettings
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -25,11 +25,13 @@ class Settings(BaseSettings):
     video_max_duration: int = 600  # 10 minutes
     frame_extraction_fps: int = 30
     yt_dlp_cookiefile: Optional[Path] = None
+    yt_dlp_concurrent_fragments: int = 8
 
     # Pose detection settings
     pose_model: Literal["openpose", "yolov8"] = "openpose"
     pose_confidence_threshold: float = 0.7
     pose_model_complexity: int = 1  # 0, 1, or 2 for legacy compatibility
+    analysis_frame_size: Optional[int] = 640  # Longest frame side fed to pose detection (None keeps source size)
 
     # OpenPose specific settings
     openpose_hand_detection: bool = True
@@ -43,6 +45,7 @@ class Settings(BaseSettings):
     analysis_flow_weight: float = 0.3
     analysis_balance_weight: float = 0.3
     analysis_smoothness_weight: float = 0.4
+    analysis_legacy_json: bool = False  # Also return per-keypoint pose_frames dicts alongside the landmarks file
 
     # Viewer settings
     viewer_quality: Literal["low", "medium", "high"] = "high"
@@ -61,37 +64,50 @@ class Settings(BaseSettings):
     output_dir: Path = Path("./output")
     cache_enabled: bool = True
     cache_ttl: int = 3600  # 1 hour
+    cache_dir: Path = Path.home() / ".cache" / "flowstate"  # Cached pose detections
 
     # Performance settings
     use_gpu: bool = True
     num_workers: int = 4
+    cuda_streams: int = 1  # Concurrent GPU detectors, each with its own model copy and CUDA stream
     batch_size: int = 16
-
-    @validator("temp_dir", "output_dir", pre=True)
+    # torch.compile mode for the PyTorch pose model on CUDA (requires a recent ultralytics)
+    torch_compile: Optional[Literal["default", "reduce-overhead", "max-autotune-no-cudagraphs"]] = None
+    use_tensorrt: bool = False  # Export pose model to a TensorRT engine on CUDA
+    tensorrt_precision: Literal["fp16", "int8"] = "fp16"
+    tensorrt_calibration_data: str = "coco8-pose.yaml"  # Dataset used for INT8 calibration
+    tensorrt_int8_max_error: float = 3.0  # Max mean keypoint error (px) vs FP32 for INT8
+    engine_cache_dir: Path = Path.home() / ".cache" / "flowstate" / "engines"
+
+    @field_validator("temp_dir", "output_dir", "cache_dir", "engine_cache_dir", mode="before")
+    @classmethod
     def ensure_path(cls, v):
         """Ensure paths are Path objects."""
         if isinstance(v, str):
             return Path(v)
         return v
 
-    @validator("pose_confidence_threshold")
+    @field_validator("pose_confidence_threshold")
+    @classmethod
     def validate_confidence(cls, v):
         """Ensure confidence threshold is between 0 and 1."""
         if not 0 <= v <= 1:
             raise ValueError("Confidence threshold must be between 0 and 1")
         return v
 
-    @validator("pose_model_complexity")
+    @field_validator("pose_model_complexity")
+    @classmethod
     def validate_complexity(cls, v):
         """Ensure model complexity is valid."""
         if v not in [0, 1, 2]:
             raise ValueError("Model complexity must be 0, 1, or 2")
         return v
 
-    class Config:
-        env_prefix = "FLOWSTATE_"
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    model_config = SettingsConfigDict(
+        env_prefix="FLOWSTATE_",
+        env_file=".env",
+        env_file_encoding="utf-8"
+    )
 
     def create_directories(self):
         """Create necessary directories."""
@@ -99,8 +115,5 @@ class Settings(BaseSettings):
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
 
-# Global settings instance
+# Global settings instance; directories are created by the components that write to them
 settings = Settings()
-
-# Create directories on import
-settings.create_directories()
\ No newline at end of file
@@ -3,15 +3,24 @@ Video downloading and frame extraction module.
 Supports YouTube video downloads and frame extraction for pose analysis.
 """
 
-import yt_dlp
 import cv2
+import numpy as np
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Callable, Iterator
+import errno
+import os
 import shutil
+import subprocess
+import tempfile
+import threading
 
 from ..core.config import settings
 from ..core.exceptions import VideoDownloadError, InvalidURLError
 
+# Sampling gap (in source frames) from which seeking beats grab()-ing through the skipped
+# frames; roughly one GOP, since a seek has to decode forward from the previous keyframe
+SEEK_MIN_FRAME_INTERVAL = 30
+
 
 class YouTubeDownloader:
     """
@@ -20,6 +29,17 @@ class YouTubeDownloader:
 
     def __init__(self):
         self.temp_video_path: Optional[Path] = None
+        self._work_dir: Optional[Path] = None
+
+    def work_dir(self) -> Path:
+        """
+        Returns this run's scratch directory for intermediate files such as the
+        landmarks file. It is unique per run, created on first use and removed by cleanup().
+        """
+        if self._work_dir is None:
+            settings.temp_dir.mkdir(parents=True, exist_ok=True)
+            self._work_dir = Path(tempfile.mkdtemp(prefix="run_", dir=settings.temp_dir))
+        return self._work_dir
 
     def process_local_video(self, video_path: Path) -> Tuple[Path, Dict[str, Any]]:
         """
@@ -65,14 +85,17 @@ class YouTubeDownloader:
             'thumbnail': None,
         }
         
-        # Copy to temp directory if needed (for Docker compatibility)
+        # Read the video in place when it shares a file system with the temp directory.
+        # Otherwise (e.g. a Docker volume boundary) copy it there; only such a copy is
+        # registered for cleanup, so the user's file is never deleted
+        settings.temp_dir.mkdir(parents=True, exist_ok=True)
+        if os.stat(video_path).st_dev == os.stat(settings.temp_dir).st_dev:
+            return video_path, video_info
+
         temp_path = settings.temp_dir / video_path.name
-        if not temp_path.exists():
-            shutil.copy2(video_path, temp_path)
-            self.temp_video_path = temp_path
-        else:
-            self.temp_video_path = video_path
-            
+        shutil.copyfile(video_path, temp_path)
+        self.temp_video_path = temp_path
+
         return self.temp_video_path, video_info
 
     def download_video(self, url: str) -> Tuple[Path, Dict[str, Any]]:
@@ -92,6 +115,9 @@ class YouTubeDownloader:
         if "youtube.com/watch?v=" not in url and "youtu.be/" not in url:
             raise InvalidURLError("Provided URL is not a valid YouTube video URL.")
 
+        # Imported on first download; local videos never need yt-dlp
+        import yt_dlp
+
         output_template = str(settings.temp_dir / "%(id)s.%(ext)s")
         ydl_opts = {
             'format': settings.video_download_quality,
@@ -107,9 +133,15 @@ class YouTubeDownloader:
                     'skip': ['dash_manifest', 'hls_playlist']
                 }
             },
-            'cookiefile': str(settings.yt_dlp_cookiefile) if settings.yt_dlp_cookiefile else None
+            'cookiefile': str(settings.yt_dlp_cookiefile) if settings.yt_dlp_cookiefile else None,
+            'concurrent_fragment_downloads': settings.yt_dlp_concurrent_fragments
         }
 
+        # Use aria2c for multi-connection downloads when it is installed
+        if shutil.which('aria2c'):
+            ydl_opts['external_downloader'] = 'aria2c'
+            ydl_opts['external_downloader_args'] = ['-x', '16', '-k', '1M']
+
         video_info = None
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
@@ -151,84 +183,245 @@ class YouTubeDownloader:
         except Exception as e:
             raise VideoDownloadError(f"An unexpected error occurred during video download: {e}") from e
 
-    def extract_frames(self, video_path: Path) -> Path:
+    def stream_frames(self, video_path: Path, frame_callback: Callable[[np.ndarray], None],
+                      stop_event: Optional[threading.Event] = None) -> int:
         """
-        Extracts frames from a video at a specified FPS and saves them to a temporary directory.
+        Decodes frames at the extraction rate and hands them to a callback as BGR arrays.
+        Nothing is written to disk, so frames are never JPEG encoded and decoded
+        again on their way to the analyzer.
 
         Args:
             video_path: Path to the input video file.
+            frame_callback: Callback invoked with each (H, W, 3) uint8 BGR frame in playback order.
+            stop_event: Optional event that cancels decoding once set; ffmpeg is killed and
+                the frames decoded so far are counted without raising.
 
         Returns:
-            Path to the directory containing extracted frames.
+            Number of frames decoded.
+
+        Raises:
+            VideoDownloadError: If frame decoding fails.
+        """
+        cap, fps = self._open_video(video_path)
+
+        ffmpeg_path = shutil.which("ffmpeg")
+        if ffmpeg_path:
+            # The raw video pipe needs the output size up front
+            width, height = self._read_frame_size(cap)
+            # Never upsample: cap the output rate at the source frame rate
+            frame_count = self._stream_frames_ffmpeg(
+                ffmpeg_path, video_path, self._scaled_frame_size(width, height),
+                min(fps, settings.frame_extraction_fps), frame_callback, stop_event
+            )
+        else:
+            frame_count = 0
+            try:
+                for frame in self._iter_frames_opencv(cap, fps):
+                    if stop_event is not None and stop_event.is_set():
+                        break
+                    frame_callback(frame)
+                    frame_count += 1
+            except Exception as e:
+                raise VideoDownloadError(f"Error during frame extraction: {e}") from e
+
+        if stop_event is not None and stop_event.is_set():
+            return frame_count
+
+        if frame_count == 0:
+            raise VideoDownloadError("No frames were extracted. Video might be empty or corrupted.")
+
+        return frame_count
+
+    def frame_size(self, video_path: Path) -> Tuple[int, int]:
+        """
+        Returns the (width, height) of the video's frames before any downscaling for analysis.
 
         Raises:
-            VideoDownloadError: If frame extraction fails.
+            VideoDownloadError: If the video cannot be opened or has no frames.
         """
-        frames_output_dir = settings.temp_dir / "frames"
-        frames_output_dir.mkdir(parents=True, exist_ok=True)
+        cap, _ = self._open_video(video_path)
+        return self._read_frame_size(cap)
 
+    @staticmethod
+    def _read_frame_size(cap: cv2.VideoCapture) -> Tuple[int, int]:
+        """
+        Reads the (width, height) of the first frame and releases the capture.
+        OpenCV decodes in display orientation, just like ffmpeg.
+        """
+        ret, first_frame = cap.read()
+        cap.release()
+        if not ret:
+            raise VideoDownloadError("No frames were extracted. Video might be empty or corrupted.")
+        height, width = first_frame.shape[:2]
+        return width, height
+
+    def _open_video(self, video_path: Path) -> Tuple[cv2.VideoCapture, float]:
+        """
+        Opens a video with OpenCV and reads its frame rate.
+
+        Returns:
+            Tuple of (capture, fps).
+
+        Raises:
+            VideoDownloadError: If the video cannot be opened or has no frame rate.
+        """
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
             raise VideoDownloadError(f"Could not open video file: {video_path}")
 
         fps = cap.get(cv2.CAP_PROP_FPS)
         if fps == 0:
+            cap.release()
             raise VideoDownloadError("Could not determine video FPS.")
 
-        frame_interval = int(round(fps / settings.frame_extraction_fps))
-        if frame_interval == 0:
-            frame_interval = 1 # Ensure at least one frame is processed if FPS is very low
+        return cap, fps
 
-        frame_count = 0
-        extracted_count = 0
+    @staticmethod
+    def _scaled_frame_size(width: int, height: int) -> Tuple[int, int]:
+        """
+        Returns the frame size that fits the pose model input, keeping aspect ratio and never upscaling.
+        """
+        if settings.analysis_frame_size and max(width, height) > settings.analysis_frame_size:
+            scale = settings.analysis_frame_size / max(width, height)
+            return max(1, round(width * scale)), max(1, round(height * scale))
+        return width, height
+
+    def _stream_frames_ffmpeg(self, ffmpeg_path: str, video_path: Path, frame_size: Tuple[int, int],
+                              output_fps: float, frame_callback: Callable[[np.ndarray], None],
+                              stop_event: Optional[threading.Event] = None) -> int:
+        """
+        Decodes frames with a single ffmpeg invocation that writes raw BGR frames to a pipe.
+        Hardware decoding is used automatically when available. ffmpeg is killed as soon
+        as stop_event is set.
 
+        Returns:
+            Number of frames decoded.
+        """
+        width, height = frame_size
+        command = [
+            ffmpeg_path, '-hide_banner', '-nostdin',
+            '-loglevel', 'error',
+            '-hwaccel', 'auto',
+            '-i', str(video_path),
+            '-vf', f'fps={output_fps:g},scale={width}:{height}',
+            '-f', 'rawvideo',
+            '-pix_fmt', 'bgr24',
+            'pipe:1'
+        ]
+
+        frame_bytes = width * height * 3
+        frame_count = 0
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         try:
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-
-                if frame_count % frame_interval == 0:
-                    frame_filename = frames_output_dir / f"frame_{extracted_count:05d}.jpg"
-                    cv2.imwrite(str(frame_filename), frame)
-                    extracted_count += 1
+            while len(data := process.stdout.read(frame_bytes)) == frame_bytes:
+                if stop_event is not None and stop_event.is_set():
+                    # Cancelled: stop ffmpeg rather than draining the rest of the video
+                    process.kill()
+                    process.communicate()
+                    return frame_count
+                frame_callback(np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3))
                 frame_count += 1
+            stderr = process.stderr.read().decode(errors='replace')
+            process.wait()
         except Exception as e:
+            process.kill()
             raise VideoDownloadError(f"Error during frame extraction: {e}") from e
+
+        if process.returncode != 0:
+            raise VideoDownloadError("ffmpeg frame extraction failed.", details=stderr.strip())
+
+        return frame_count
+
+    def _iter_frames_opencv(self, cap, fps: float) -> Iterator[np.ndarray]:
+        """
+        Decodes the video with OpenCV, yielding frames sampled at the extraction rate.
+        The capture is released once iteration ends.
+
+        Yields:
+            BGR frames, downscaled to fit the pose model input.
+        """
+        frame_interval = int(round(fps / settings.frame_extraction_fps))
+        if frame_interval == 0:
+            frame_interval = 1 # Ensure at least one frame is processed if FPS is very low
+
+        # Downscale to fit the pose model input, never upscaling
+        scale = 1.0
+        if settings.analysis_frame_size:
+            longest_side = max(cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if longest_side > settings.analysis_frame_size:
+                scale = settings.analysis_frame_size / longest_side
+
+        try:
+            for frame in self._iter_sampled_frames(cap, frame_interval):
+                if scale < 1.0:
+                    frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                yield frame
         finally:
             cap.release()
 
-        if extracted_count == 0:
-            raise VideoDownloadError("No frames were extracted. Video might be empty or corrupted.")
+    @staticmethod
+    def _iter_sampled_frames(cap, frame_interval: int) -> Iterator[np.ndarray]:
+        """
+        Yields every frame_interval-th frame of the capture, starting with the first.
+        Wide gaps are skipped by seeking straight to the precomputed frame indices;
+        narrow gaps, and videos that do not report a frame count, are walked with grab().
+        """
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if frame_interval >= SEEK_MIN_FRAME_INTERVAL and total_frames > 0:
+            for frame_idx in np.arange(0, total_frames, frame_interval):
+                if frame_idx and not cap.set(cv2.CAP_PROP_POS_FRAMES, float(frame_idx)):
+                    break
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                yield frame
+            return
 
-        return frames_output_dir
+        # grab() advances past a frame without converting it to BGR;
+        # only sampled frames are retrieved
+        frame_count = 0
+        while cap.grab():
+            if frame_count % frame_interval == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                yield frame
+            frame_count += 1
 
     def cleanup(self):
         """
         Cleans up temporary files and directories created during the process.
+        Each path is removed directly instead of being checked first; a missing
+        path is simply skipped.
         """
-        if self.temp_video_path and self.temp_video_path.exists():
+        if self.temp_video_path:
             try:
                 self.temp_video_path.unlink()  # Delete the video file
                 if settings.debug:
                     print(f"Cleaned up video file: {self.temp_video_path}")
+            except FileNotFoundError:
+                pass
             except OSError as e:
                 print(f"Warning: Could not delete temporary video file {self.temp_video_path}: {e}")
 
-        frames_dir = settings.temp_dir / "frames"
-        if frames_dir.exists() and frames_dir.is_dir():
+        if self._work_dir is not None:
             try:
-                shutil.rmtree(frames_dir)
+                shutil.rmtree(self._work_dir)
                 if settings.debug:
-                    print(f"Cleaned up frames directory: {frames_dir}")
+                    print(f"Cleaned up work directory: {self._work_dir}")
+            except FileNotFoundError:
+                pass
             except OSError as e:
-                print(f"Warning: Could not delete temporary frames directory {frames_dir}: {e}")
+                print(f"Warning: Could not delete temporary work directory {self._work_dir}: {e}")
+            self._work_dir = None
 
-        # Optionally, clean the main temp_dir if it's empty or if we want to be aggressive
-        if settings.temp_dir.exists() and settings.temp_dir.is_dir() and not list(settings.temp_dir.iterdir()):
-            try:
-                settings.temp_dir.rmdir()
-                if settings.debug:
-                    print(f"Cleaned up temporary directory: {settings.temp_dir}")
-            except OSError as e:
-                print(f"Warning: Could not delete temporary directory {settings.temp_dir}: {e}")
\ No newline at end of file
+        # Remove the main temp_dir too if nothing else is left in it
+        try:
+            settings.temp_dir.rmdir()
+            if settings.debug:
+                print(f"Cleaned up temporary directory: {settings.temp_dir}")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                print(f"Warning: Could not delete temporary directory {settings.temp_dir}: {e}")
@@ -0,0 +1,100 @@
+"""
+Numba-compiled motion metrics.
+Computes the body scores that make up the flow score in one fused pass over the keypoint arrays.
+"""
+
+from typing import Tuple
+import numpy as np
+
+try:
+    import numba  # Optional: JIT-compile the metric kernel
+    from numba import prange
+except ImportError:
+    numba = None
+    prange = range
+
+
+def _body_motion_metrics(xy: np.ndarray, conf: np.ndarray, threshold: float) -> Tuple[float, float, float]:
+    """
+    Calculate smoothness, balance and energy scores from (T, K, 2) keypoints.
+    Each frame is visited once; per-frame partial sums are reduced in parallel.
+
+    Args:
+        xy: Keypoint coordinates with shape (T, K, 2)
+        conf: Keypoint confidences with shape (T, K)
+        threshold: Minimum confidence for a keypoint to be used
+
+    Returns:
+        Tuple of (smoothness, balance, energy) scores
+    """
+    num_frames = xy.shape[0]
+    num_keypoints = xy.shape[1]
+
+    accel_sum = 0.0
+    accel_sq_sum = 0.0
+    accel_count = 0
+    balance_sum = 0.0
+    balance_count = 0
+    movement_sum = 0.0
+    moving_frames = 0
+
+    for t in prange(num_frames):
+        # Balance: COM-BOS distance from hips (11, 12) and ankles (15, 16)
+        if (conf[t, 11] > threshold and conf[t, 12] > threshold and
+                conf[t, 15] > threshold and conf[t, 16] > threshold):
+            com_x = (xy[t, 11, 0] + xy[t, 12, 0]) / 2
+            com_y = (xy[t, 11, 1] + xy[t, 12, 1]) / 2
+            base_x = (xy[t, 15, 0] + xy[t, 16, 0]) / 2
+            base_y = (xy[t, 15, 1] + xy[t, 16, 1]) / 2
+            distance = np.sqrt((com_x - base_x) ** 2 + (com_y - base_y) ** 2)
+            balance_sum += max(0.0, 100.0 - distance * 0.5)
+            balance_count += 1
+
+        if t + 1 < num_frames:
+            # Energy: mean displacement of keypoints confident in both frames
+            frame_movement = 0.0
+            frame_keypoints = 0
+            for k in range(num_keypoints):
+                if conf[t, k] > threshold and conf[t + 1, k] > threshold:
+                    dx = xy[t + 1, k, 0] - xy[t, k, 0]
+                    dy = xy[t + 1, k, 1] - xy[t, k, 1]
+                    frame_movement += np.sqrt(dx * dx + dy * dy)
+                    frame_keypoints += 1
+            if frame_keypoints > 0:
+                movement_sum += frame_movement / frame_keypoints
+                moving_frames += 1
+
+        if t + 2 < num_frames:
+            # Smoothness: acceleration of keypoints confident in all three frames
+            # (accumulate per frame, then reduce once, so prange can merge the partial sums)
+            frame_accel = 0.0
+            frame_accel_sq = 0.0
+            frame_accel_count = 0
+            for k in range(num_keypoints):
+                if conf[t, k] > threshold and conf[t + 1, k] > threshold and conf[t + 2, k] > threshold:
+                    ax = xy[t + 2, k, 0] - 2.0 * xy[t + 1, k, 0] + xy[t, k, 0]
+                    ay = xy[t + 2, k, 1] - 2.0 * xy[t + 1, k, 1] + xy[t, k, 1]
+                    accel = np.sqrt(ax * ax + ay * ay)
+                    frame_accel += accel
+                    frame_accel_sq += accel * accel
+                    frame_accel_count += 1
+            accel_sum += frame_accel
+            accel_sq_sum += frame_accel_sq
+            accel_count += frame_accel_count
+
+    smoothness = 0.0
+    if accel_count > 0:
+        mean = accel_sum / accel_count
+        variance = max(0.0, accel_sq_sum / accel_count - mean * mean)
+        smoothness = max(0.0, 100.0 - np.sqrt(variance) * 10)
+
+    balance = balance_sum / balance_count if balance_count > 0 else 0.0
+    energy = min(100.0, movement_sum / moving_frames * 2.0) if moving_frames > 0 else 0.0
+
+    return smoothness, balance, energy
+
+
+# Compiled kernel, or None when numba is not installed
+body_motion_metrics = (
+    numba.njit(parallel=True, fastmath=True, cache=True)(_body_motion_metrics) if numba is not None else None
+)
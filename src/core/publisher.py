@@ -3,15 +3,37 @@ GitHub Pages publishing module.
 Handles creating GitHub repositories, pushing content, and enabling GitHub Pages.
 """
 
-from github import Github, GithubException
 from pathlib import Path
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, List, Tuple, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
 import base64
+import fnmatch
+import hashlib
+import mmap
+import os
 import time
 
 from ..core.config import settings
 from ..core.exceptions import GitHubAuthError, GitHubPublishError
 
+# Local files never published with the viewer (matched against every path component)
+UPLOAD_IGNORE_PATTERNS = (".git", ".DS_Store", "Thumbs.db", "__pycache__", "*.pyc", "*.swp", "*~")
+
+# Viewer assets uploaded as UTF-8 text rather than base64
+TEXT_BLOB_SUFFIXES = {".html", ".js", ".css", ".json", ".svg"}
+
+# Window for base64-encoding binary assets; a multiple of 3, so windows encode without padding
+BASE64_CHUNK_SIZE = 3 << 20
+
+# PyGithub is imported on first use, so runs that never publish do not load it
+if TYPE_CHECKING:
+    from github import Github, InputGitTreeElement
+    from github.AuthenticatedUser import AuthenticatedUser
+
+# Authenticated clients and their users, shared by all publishers in the process.
+# Keyed by the token's SHA-256 so the token itself is not kept as a key.
+_github_clients: Dict[str, Tuple["Github", "AuthenticatedUser"]] = {}
+
 
 class GitHubPublisher:
     """
@@ -19,26 +41,37 @@ class GitHubPublisher:
     """
 
     def __init__(self):
-        self.github_client: Optional[Github] = None
+        self.github_client: Optional["Github"] = None
+        self.github_user: Optional["AuthenticatedUser"] = None
 
-    def _get_github_client(self, token: str) -> Github:
+    def _get_github_client(self, token: str) -> "Github":
         """
         Initializes and returns a GitHub client.
+        Authenticated clients are cached per token for the life of the process, so
+        repeated deploys skip the authentication round-trip.
         """
-        if not self.github_client:
+        from github import Github, GithubException
+
+        token_key = hashlib.sha256(token.encode()).hexdigest()
+        cached = _github_clients.get(token_key)
+        if cached is None:
             try:
-                self.github_client = Github(
+                client = Github(
                     login_or_token=token,
                     timeout=settings.github_api_timeout,
                     retry=settings.github_retry_attempts,
                     per_page=100
                 )
-                # Test authentication
-                self.github_client.get_user().login
+                # Test authentication; this also loads the user that deploy() works with
+                user = client.get_user()
+                user.login
             except GithubException as e:
                 raise GitHubAuthError(f"Invalid GitHub token or API error: {e.data.get('message', str(e))}") from e
             except Exception as e:
                 raise GitHubAuthError(f"Failed to initialize GitHub client: {e}") from e
+            cached = _github_clients[token_key] = (client, user)
+
+        self.github_client, self.github_user = cached
         return self.github_client
 
     def deploy(self, token: str, repo_name: str, viewer_dir: Path,
@@ -58,8 +91,10 @@ class GitHubPublisher:
         Raises:
             GitHubPublishError: If deployment fails.
         """
-        g = self._get_github_client(token)
-        user = g.get_user()
+        from github import GithubException
+
+        self._get_github_client(token)
+        user = self.github_user
 
         try:
             # 1. Create or get repository
@@ -113,17 +148,16 @@ class GitHubPublisher:
 
             # 4. Get Pages URL
             if progress_callback: progress_callback(4)
-            # GitHub Pages can take a moment to become active
-            pages_url = None
+            # GitHub Pages can take a moment to become active; only poll while the URL is unknown
+            pages_url = pages.html_url
             for _ in range(settings.github_retry_attempts):
+                if pages_url:
+                    break
+                time.sleep(settings.github_retry_delay)
                 try:
-                    pages = repo.get_pages()
-                    pages_url = pages.html_url
-                    if pages_url:
-                        break
+                    pages_url = repo.get_pages().html_url
                 except GithubException:
                     pass
-                time.sleep(settings.github_retry_delay)
 
             if not pages_url:
                 raise GitHubPublishError("Could not retrieve GitHub Pages URL after deployment.")
@@ -135,37 +169,127 @@ class GitHubPublisher:
         except Exception as e:
             raise GitHubPublishError(f"An unexpected error occurred during deployment: {e}") from e
 
-    def _upload_directory_to_repo(self, repo, directory_path: Path, path_in_repo: str = ""):
+    def _upload_directory_to_repo(self, repo, directory_path: Path, branch: str = "gh-pages"):
         """
-        Recursively uploads files from a local directory to a GitHub repository.
+        Uploads all files of a local directory to a branch in a single commit.
+        Blobs are created concurrently; one tree, one commit and one ref update then
+        replace the per-file contents API round-trips. Files whose content is already
+        on the branch are detected locally from blob hashes and not uploaded again.
         """
-        for item in directory_path.iterdir():
-            if item.is_file():
-                file_content = item.read_bytes()
-                encoded_content = base64.b64encode(file_content).decode('utf-8')
-                repo_file_path = f"{path_in_repo}/{item.name}".lstrip('/')
+        from github import GithubException, InputGitTreeElement
 
-                try:
-                    # Check if file exists to decide between create or update
-                    contents = repo.get_contents(repo_file_path, ref="gh-pages")
-                    repo.update_file(
-                        path=repo_file_path,
-                        message=f"Update {repo_file_path}",
-                        content=encoded_content,
-                        sha=contents.sha,
-                        branch="gh-pages"
-                    )
-                    print(f"Updated: {repo_file_path}")
-                except GithubException as e:
-                    if e.status == 404: # File does not exist, create it
-                        repo.create_file(
-                            path=repo_file_path,
-                            message=f"Add {repo_file_path}",
-                            content=encoded_content,
-                            branch="gh-pages"
-                        )
-                        print(f"Created: {repo_file_path}")
-                    else:
-                        raise GitHubPublishError(f"Failed to upload file {repo_file_path}: {e.data.get('message', str(e))}") from e
-            elif item.is_dir():
-                self._upload_directory_to_repo(repo, item, f"{path_in_repo}/{item.name}")
+        files = self._list_upload_files(directory_path)
+
+        def _create_blob(path: Path) -> Optional["InputGitTreeElement"]:
+            repo_file_path = path.relative_to(directory_path).as_posix()
+            existing_sha = existing_blobs.get(repo_file_path)
+            if existing_sha is not None and existing_sha == self._git_blob_sha(path):
+                return None  # Unchanged; kept through the base tree
+
+            blob = repo.create_git_blob(**self._blob_payload(path))
+            return InputGitTreeElement(path=repo_file_path, mode="100644", type="blob", sha=blob.sha)
+
+        try:
+            # Commit on top of the branch, or start it from the default branch
+            try:
+                ref = repo.get_git_ref(f"heads/{branch}")
+                parent_sha = ref.object.sha
+            except GithubException as e:
+                if e.status != 404:
+                    raise
+                ref = None
+                parent_sha = repo.get_branch(repo.default_branch).commit.sha
+            parent_commit = repo.get_git_commit(parent_sha)
+
+            # Paths and blob hashes already on the branch, fetched in one call
+            existing_blobs = {
+                element.path: element.sha
+                for element in repo.get_git_tree(parent_commit.tree.sha, recursive=True).tree
+                if element.type == "blob"
+            }
+
+            with ThreadPoolExecutor(max_workers=max(1, settings.num_workers)) as executor:
+                tree_elements = [element for element in executor.map(_create_blob, files) if element is not None]
+
+            if not tree_elements:
+                if ref is None:
+                    repo.create_git_ref(ref=f"refs/heads/{branch}", sha=parent_sha)
+                print(f"All {len(files)} files are already up to date on '{branch}'")
+                return
+
+            tree = repo.create_git_tree(tree_elements, base_tree=parent_commit.tree)
+            commit = repo.create_git_commit(
+                message=f"Deploy FlowState viewer ({len(files)} files)", tree=tree, parents=[parent_commit]
+            )
+            if ref is not None:
+                ref.edit(sha=commit.sha)
+            else:
+                repo.create_git_ref(ref=f"refs/heads/{branch}", sha=commit.sha)
+        except GithubException as e:
+            raise GitHubPublishError(f"Failed to upload viewer files: {e.data.get('message', str(e))}") from e
+
+        print(f"Uploaded {len(tree_elements)} of {len(files)} files to '{branch}' in commit {commit.sha[:7]}")
+
+    @staticmethod
+    def _is_ignored(name: str) -> bool:
+        """
+        Returns True if a file or directory name matches UPLOAD_IGNORE_PATTERNS.
+        """
+        return any(fnmatch.fnmatch(name, pattern) for pattern in UPLOAD_IGNORE_PATTERNS)
+
+    @classmethod
+    def _list_upload_files(cls, directory_path: Path) -> List[Path]:
+        """
+        Returns the files to publish from a directory tree, sorted.
+        The tree is walked with os.scandir, whose entries carry their file type, and
+        ignored directories are pruned rather than descended into.
+        """
+        files = []
+        pending = [directory_path]
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if cls._is_ignored(entry.name):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(Path(entry.path))
+                    elif entry.is_file():
+                        files.append(Path(entry.path))
+        return sorted(files)
+
+    @staticmethod
+    def _blob_payload(path: Path) -> Dict[str, str]:
+        """
+        Returns the create_git_blob arguments for a file.
+        Text assets are sent as UTF-8 as-is; everything else is base64-encoded.
+        The file is memory-mapped and encoded in windows, so its raw bytes are
+        never copied into memory whole.
+        """
+        is_text = path.suffix.lower() in TEXT_BLOB_SUFFIXES
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return {"content": "", "encoding": "utf-8" if is_text else "base64"}
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if is_text:
+                    try:
+                        return {"content": str(mapped, "utf-8"), "encoding": "utf-8"}
+                    except UnicodeDecodeError:
+                        pass
+                content = "".join(
+                    base64.b64encode(mapped[start:start + BASE64_CHUNK_SIZE]).decode("ascii")
+                    for start in range(0, len(mapped), BASE64_CHUNK_SIZE)
+                )
+        return {"content": content, "encoding": "base64"}
+
+    @staticmethod
+    def _git_blob_sha(path: Path) -> str:
+        """
+        Returns the SHA-1 git assigns to a blob with the file's content.
+        The file is hashed in chunks, so it is never held in memory whole.
+        """
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(b"blob %d\0" % os.fstat(f.fileno()).st_size)
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+        return digest.hexdigest()
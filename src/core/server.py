@@ -5,6 +5,7 @@ Provides a fallback option when GitHub Pages deployment is not available.
 
 import http.server
 import socketserver
+import hashlib
 import json
 import os
 import sys
@@ -19,34 +20,104 @@ import logging
 from ..core.config import settings
 
 
+# ETags of served files, keyed by path and invalidated when size or mtime changes
+_etag_cache: Dict[str, tuple] = {}
+
+
+def _file_etag(path: str) -> str:
+    """Return a content ETag for a file, hashing it only when it has changed."""
+    stat = os.stat(path)
+    cached = _etag_cache.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    etag = f'"{digest.hexdigest()}"'
+    _etag_cache[path] = (stat.st_mtime_ns, stat.st_size, etag)
+    return etag
+
+
 class FlowStateHandler(http.server.SimpleHTTPRequestHandler):
     """HTTP request handler with CORS support for FlowState viewer."""
 
+    # Keep connections open across asset requests; every response carries a Content-Length
+    protocol_version = "HTTP/1.1"
+    timeout = 30  # Seconds before an idle keep-alive connection is dropped
+
+    etag: Optional[str] = None
+
     def end_headers(self):
         """Add CORS and cache headers."""
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.send_header('Cache-Control', 'no-cache, must-revalidate')
+        if self.etag:
+            self.send_header('ETag', self.etag)
         super().end_headers()
 
+    def send_head(self):
+        """Answer revalidation requests for unchanged files with 304 Not Modified."""
+        self.etag = None
+        path = self.translate_path(self.path)
+        if os.path.isfile(path):
+            try:
+                self.etag = _file_etag(path)
+            except OSError:
+                pass
+
+            if_none_match = self.headers.get('If-None-Match')
+            if self.etag and if_none_match:
+                tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+                if '*' in tags or self.etag in tags:
+                    self.send_response(http.HTTPStatus.NOT_MODIFIED)
+                    self.end_headers()
+                    return None
+
+        return super().send_head()
+
     def do_OPTIONS(self):
         """Handle preflight CORS requests."""
         self.send_response(200)
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
+    def copyfile(self, source, outputfile):
+        """Send file bodies with sendfile() instead of copying them through Python."""
+        self.connection.sendfile(source)
+
     def log_message(self, format, *args):
         """Custom logging with timestamp."""
         timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
         logging.info(f"[{timestamp}] {format % args}")
 
 
+class FlowStateTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """TCP server handling each request on its own thread so viewer assets load concurrently."""
+
+    daemon_threads = True
+    allow_reuse_address = True  # Read by server_bind(), so it must be set before binding
+
+
+class FlowStateSharedTCPServer(FlowStateTCPServer):
+    """FlowStateTCPServer that sets SO_REUSEPORT, so several processes can share one port."""
+
+    allow_reuse_port = True
+
+
 class FlowStateServer:
     """Production web server for hosting FlowState visualizations."""
 
-    def __init__(self, port: int = 8080, directory: Optional[Path] = None, host: str = '0.0.0.0'):
+    def __init__(self, port: int = 8080, directory: Optional[Path] = None, host: str = '0.0.0.0',
+                 reuse_port: bool = False):
         self.port = port
         self.host = host
+        # Off by default: with SO_REUSEPORT a second server would silently share the port
+        # instead of failing with "address already in use"
+        self.reuse_port = reuse_port
         self.directory = directory or Path(settings.output_dir) / "viewer"
         self.server = None
         self.server_thread = None
@@ -83,8 +154,8 @@ class FlowStateServer:
         try:
             # Create the server
             handler = partial(FlowStateHandler, directory=str(self.directory))
-            self.server = socketserver.TCPServer((self.host, self.port), handler)
-            self.server.allow_reuse_address = True
+            server_class = FlowStateSharedTCPServer if self.reuse_port else FlowStateTCPServer
+            self.server = server_class((self.host, self.port), handler)
             
             # Start server in a separate thread
             self.server_thread = threading.Thread(target=self.server.serve_forever)
@@ -4,7 +4,10 @@ Provides retry logic, timing, and validation decorators.
 """
 
 import time
+import random
 import functools
+from collections import OrderedDict
+from pathlib import Path
 from typing import Callable, Any, Optional, Type, Tuple
 from .exceptions import FlowStateError
 
@@ -14,7 +17,8 @@ def retry(
     attempts: int = 3,
     delay: float = 1.0,
     backoff: float = 2.0,
-    max_delay: float = 60.0
+    max_delay: float = 60.0,
+    jitter: bool = True
 ) -> Callable:
     """
     Retry decorator with exponential backoff.
@@ -25,14 +29,18 @@ def retry(
         delay: Initial delay between retries in seconds
         backoff: Multiplication factor for delay
         max_delay: Maximum delay between retries
+        jitter: Sleep a random time up to each backoff delay ("full jitter"),
+            so concurrent callers do not retry in lockstep
         
     Returns:
         Decorated function
     """
+    # Backoff schedule, computed once rather than on every call
+    delays = [min(max_delay, delay * backoff ** i) for i in range(max(0, attempts - 1))]
+    
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            current_delay = delay
             last_exception = None
             
             for attempt in range(attempts):
@@ -42,8 +50,7 @@ def retry(
                     last_exception = e
                     
                     if attempt < attempts - 1:
-                        time.sleep(current_delay)
-                        current_delay = min(current_delay * backoff, max_delay)
+                        time.sleep(random.uniform(0, delays[attempt]) if jitter else delays[attempt])
                     else:
                         # Last attempt failed
                         if isinstance(e, FlowStateError):
@@ -74,12 +81,12 @@ def timed(prefix: str = "") -> Callable:
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                elapsed = time.time() - start_time
+                elapsed = time.perf_counter() - start_time
                 message = f"{prefix} " if prefix else ""
                 message += f"{func.__name__} took {elapsed:.2f}s"
                 print(message)
@@ -126,11 +133,9 @@ def ensure_path_exists(create: bool = True) -> Callable:
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            from pathlib import Path
-            
             # Check first argument if it's a path
             if args and isinstance(args[0], (str, Path)):
-                path = Path(args[0])
+                path = args[0] if isinstance(args[0], Path) else Path(args[0])
                 if not path.exists():
                     if create and path.suffix == '':  # It's a directory
                         path.mkdir(parents=True, exist_ok=True)
@@ -143,41 +148,66 @@ def ensure_path_exists(create: bool = True) -> Callable:
     return decorator
 
 
-def cached(ttl: Optional[int] = None) -> Callable:
+# Separates positional from keyword arguments in cache keys
+_KWARGS_MARK = object()
+
+
+def cached(ttl: Optional[int] = None, maxsize: Optional[int] = None) -> Callable:
     """
-    Simple caching decorator with optional TTL.
+    Simple caching decorator with optional TTL and LRU size bound.
+    Without a TTL the function is wrapped in functools.lru_cache, so arguments
+    must be hashable and cache_info() returns lru_cache's statistics.
     
     Args:
         ttl: Time-to-live in seconds (None for no expiration)
+        maxsize: Maximum number of cached results, evicting the least recently
+            used first (None for no limit)
         
     Returns:
         Decorated function
     """
     def decorator(func: Callable) -> Callable:
-        cache = {}
-        cache_times = {}
+        if ttl is None:
+            # Nothing expires, so the C implementation covers it
+            wrapper = functools.lru_cache(maxsize=maxsize)(func)
+            wrapper.clear_cache = wrapper.cache_clear
+            return wrapper
+        
+        # (result, timestamp) per key, so a hit costs a single lookup
+        cache: OrderedDict[Any, Tuple[Any, float]] = OrderedDict()
+        cache_get = cache.get
+        _monotonic = time.monotonic  # Immune to wall-clock jumps
         
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            # Create cache key from arguments
-            key = str(args) + str(kwargs)
+            # Hash the arguments themselves; the marker keeps keyword
+            # arguments from colliding with positional ones
+            key = args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items())) if kwargs else args
+            try:
+                entry = cache_get(key)
+            except TypeError:
+                # Unhashable arguments fall back to a string key
+                key = str(args) + str(kwargs)
+                entry = cache_get(key)
             
-            # Check if cached value exists and is still valid
-            if key in cache:
-                if ttl is None:
-                    return cache[key]
-                elif time.time() - cache_times[key] < ttl:
-                    return cache[key]
+            # Return the cached value if it is still valid
+            if entry is not None and _monotonic() - entry[1] < ttl:
+                if maxsize:
+                    cache.move_to_end(key)
+                return entry[0]
             
             # Compute and cache the result
             result = func(*args, **kwargs)
-            cache[key] = result
-            cache_times[key] = time.time()
+            cache[key] = (result, _monotonic())
+            if maxsize:
+                cache.move_to_end(key)
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
             
             return result
         
         # Add cache control methods
-        wrapper.clear_cache = lambda: (cache.clear(), cache_times.clear())
+        wrapper.clear_cache = cache.clear
         wrapper.cache_info = lambda: {'size': len(cache), 'keys': list(cache.keys())}
         
         return wrapper
@@ -5,18 +5,22 @@ Validation utilities for various inputs.
 import re
 from ..core.exceptions import InvalidURLError, GitHubAuthError
 
+# Finds the video ID in the various YouTube URL formats
+_YOUTUBE_URL_RE = re.compile(
+    r'(?:https?://)?(?:www\.)?'
+    r'(?:youtube\.com|youtu\.be)/'
+    r'(?:watch\?v=|embed/|v/|.+\?v=)?([^"&?/ ]{11})'
+)
+
+# Classic GitHub token: 40 hex characters
+_CLASSIC_GITHUB_TOKEN_RE = re.compile(r'[0-9a-fA-F]{40}')
+
 
 def validate_youtube_url(url: str) -> str:
     """
     Validates if a given string is a valid YouTube video URL and extracts the video ID.
     """
-    # Regex to find video ID from various YouTube URL formats
-    youtube_regex = (
-        r'(?:https?:\/\/)?(?:www\.)?'
-        '(?:youtube\.com|youtu\.be)\/'
-        '(?:watch\?v=|embed\/|v\/|.+\?v=)?([^"&?\/ ]{11})'
-    )
-    match = re.search(youtube_regex, url)
+    match = _YOUTUBE_URL_RE.search(url)
     if not match or not match.group(1):
         raise InvalidURLError(f"Could not extract a valid YouTube video ID from URL: {url}")
 
@@ -38,11 +42,11 @@ def validate_github_token(token: str) -> bool:
     Raises:
         GitHubAuthError: If the token format is invalid.
     """
-    # Classic token: 40 hex characters
-    if re.fullmatch(r'[0-9a-fA-F]{40}', token):
-        return True
     # Fine-grained token: starts with ghp_ and is longer
     if token.startswith('ghp_') and len(token) > 40:
         return True
+    # Classic token: 40 hex characters; the pattern only runs on tokens of that length
+    if len(token) == 40 and _CLASSIC_GITHUB_TOKEN_RE.fullmatch(token):
+        return True
 
     raise GitHubAuthError("Invalid GitHub token format. Expected a 40-character hexadecimal string or a fine-grained token starting with 'ghp_'.")
@@ -6,11 +6,20 @@ Builds the interactive 3D visualization from pose analysis data.
 from pathlib import Path
 from typing import Optional, Dict, Any
 import json
+import os
 import shutil
 
 from ..core.config import settings
 from ..core.exceptions import ViewerBuildError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Template directory shipped alongside this module, resolved once at import
+VIEWER_TEMPLATE_PATH = Path(__file__).parent / "template"
+
 
 class ViewerBuilder:
     """
@@ -18,7 +27,7 @@ class ViewerBuilder:
     """
 
     def __init__(self):
-        self.viewer_template_path = Path(__file__).parent / "template"
+        self.viewer_template_path = VIEWER_TEMPLATE_PATH
         if not self.viewer_template_path.is_dir():
             # This path might be different in a packaged environment
             # For now, assume it's relative to the current file.
@@ -44,15 +53,28 @@ class ViewerBuilder:
         output_viewer_dir.mkdir(parents=True, exist_ok=True)
 
         try:
-            # Copy template files
+            # Link template files into place; data.js is skipped because it is regenerated
+            # below, and writing through a link would overwrite the template's copy
             if self.viewer_template_path.is_dir():
-                shutil.copytree(self.viewer_template_path, output_viewer_dir, dirs_exist_ok=True)
+                shutil.copytree(
+                    self.viewer_template_path, output_viewer_dir, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("data.js"), copy_function=self._link_or_copy
+                )
             else:
                 raise ViewerBuildError(f"Viewer template directory not found at {self.viewer_template_path}")
 
+            # Ship landmarks as a binary asset instead of per-frame JSON objects
+            pose_data = dict(pose_data)
+            landmarks_bin_path = pose_data.pop("landmarks_bin_path", None)
+            landmarks_meta = None
+            if landmarks_bin_path:
+                landmarks_meta = self._copy_landmarks(Path(landmarks_bin_path), output_viewer_dir)
+                pose_data.pop("pose_frames", None)
+
             # Prepare data for JavaScript
             viewer_data = {
                 "poseData": pose_data,
+                "landmarks": landmarks_meta,
                 "videoInfo": {
                     "title": video_info.get("title", "Untitled Video"),
                     "uploader": video_info.get("uploader", "Unknown"),
@@ -71,10 +93,54 @@ class ViewerBuilder:
             # Save data to a JSON file in the viewer directory
             data_file_path = output_viewer_dir / "data.js"
             # We'll wrap it in a JS variable declaration for easy loading
-            with open(data_file_path, "w", encoding="utf-8") as f:
-                f.write(f"const flowStateData = {json.dumps(viewer_data, indent=2)};")
+            if orjson is not None:
+                # C encoder that writes UTF-8 bytes and handles numpy values natively
+                with open(data_file_path, "wb") as f:
+                    f.write(b"const flowStateData = ")
+                    f.write(orjson.dumps(viewer_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+                    f.write(b";")
+            else:
+                # The JSON is streamed compactly into the file rather than built as one string first
+                with open(data_file_path, "w", encoding="utf-8") as f:
+                    f.write("const flowStateData = ")
+                    json.dump(viewer_data, f, separators=(",", ":"))
+                    f.write(";")
 
             return output_viewer_dir
 
         except Exception as e:
             raise ViewerBuildError(f"Failed to generate 3D viewer: {e}") from e
+
+    @staticmethod
+    def _link_or_copy(src: str, dst: str) -> None:
+        """
+        Hard-links a template file into the viewer directory, replacing any previous
+        file there. Falls back to copying when linking is not possible, e.g. across
+        file systems.
+        """
+        try:
+            os.unlink(dst)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    def _copy_landmarks(self, landmarks_bin_path: Path, output_viewer_dir: Path) -> Dict[str, Any]:
+        """
+        Copy the binary landmarks file into the viewer directory.
+
+        Args:
+            landmarks_bin_path: Path to the float16 landmarks file written by the analyzer.
+            output_viewer_dir: Directory of the generated viewer.
+
+        Returns:
+            Landmark metadata from the sidecar, with the URL of the copied asset.
+        """
+        with open(landmarks_bin_path.with_suffix(".json"), "r", encoding="utf-8") as f:
+            landmarks_meta = json.load(f)
+
+        shutil.copyfile(landmarks_bin_path, output_viewer_dir / "landmarks.bin")
+        landmarks_meta["url"] = "landmarks.bin"
+        return landmarks_meta
@@ -17,10 +17,19 @@ import time
 from typing import Optional, Dict, Any
 import threading
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class FlowStateDevHandler(http.server.SimpleHTTPRequestHandler):
     """Custom handler for the development server with CORS support and enhanced features."""
 
+    # Keep connections open across asset requests; every response carries a Content-Length
+    protocol_version = "HTTP/1.1"
+    timeout = 30  # Seconds before an idle keep-alive connection is dropped
+
     def end_headers(self):
         """Add CORS headers to allow cross-origin requests."""
         self.send_header('Access-Control-Allow-Origin', '*')
@@ -32,14 +41,26 @@ class FlowStateDevHandler(http.server.SimpleHTTPRequestHandler):
     def do_OPTIONS(self):
         """Handle preflight CORS requests."""
         self.send_response(200)
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
+    def copyfile(self, source, outputfile):
+        """Send file bodies with sendfile() instead of copying them through Python."""
+        self.connection.sendfile(source)
+
     def log_message(self, format, *args):
         """Custom logging with timestamp."""
         timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
         print(f"[{timestamp}] {format % args}")
 
 
+class DevTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """TCP server handling each request on its own thread so viewer assets load in parallel."""
+
+    daemon_threads = True
+    allow_reuse_address = True  # Read by server_bind(), so it must be set before binding
+
+
 class DevelopmentServer:
     """Development server for testing FlowState viewer locally."""
 
@@ -51,38 +72,41 @@ class DevelopmentServer:
 
     def generate_sample_data(self) -> Dict[str, Any]:
         """Generate sample pose data for testing if no real data is available."""
-        import random
-        
+        import numpy as np
+
+        rng = np.random.default_rng()
+
         # Generate sample pose landmarks for 60 frames (2 seconds at 30fps)
         num_frames = 60
         num_joints = 33  # MediaPipe pose landmarks
-        
-        pose_landmarks = []
-        for frame in range(num_frames):
-            frame_landmarks = []
-            for joint in range(num_joints):
-                # Create smooth movement using sine waves
-                t = frame / num_frames * 2 * 3.14159
-                x = random.uniform(-1, 1) + 0.2 * float(f"{0.2 * (1 + joint / num_joints) * (-1 if joint % 2 else 1):.3f}")
-                y = random.uniform(0, 2) + 0.3 * float(f"{0.3 * (1 + 0.5 * (joint % 5 / 5)):.3f}")
-                z = 0.1 * float(f"{0.1 * (0.5 + 0.5 * (joint % 3 / 3)):.3f}")
-                
-                frame_landmarks.append({
-                    "x": x,
-                    "y": y,
-                    "z": z,
-                    "visibility": random.uniform(0.8, 1.0)
-                })
-            pose_landmarks.append(frame_landmarks)
+
+        # Fixed per-joint offsets (rounded to 3 decimals) on top of random jitter
+        joints = np.arange(num_joints)
+        x_offset = 0.2 * np.round(0.2 * (1 + joints / num_joints) * np.where(joints % 2, -1, 1), 3)
+        y_offset = 0.3 * np.round(0.3 * (1 + 0.5 * (joints % 5 / 5)), 3)
+        z = 0.1 * np.round(0.1 * (0.5 + 0.5 * (joints % 3 / 3)), 3)
+
+        xs = (rng.uniform(-1, 1, (num_frames, num_joints)) + x_offset).tolist()
+        ys = (rng.uniform(0, 2, (num_frames, num_joints)) + y_offset).tolist()
+        visibility = rng.uniform(0.8, 1.0, (num_frames, num_joints)).tolist()
+        zs = z.tolist()
+
+        pose_landmarks = [
+            [
+                {"x": x, "y": y, "z": z_j, "visibility": v}
+                for x, y, z_j, v in zip(frame_x, frame_y, zs, frame_vis)
+            ]
+            for frame_x, frame_y, frame_vis in zip(xs, ys, visibility)
+        ]
         
         return {
             "poseData": {
                 "pose_landmarks": pose_landmarks,
                 "overall_scores": {
-                    "flow": random.uniform(70, 95),
-                    "balance": random.uniform(65, 90),
-                    "smoothness": random.uniform(75, 98),
-                    "energy": random.uniform(60, 85)
+                    "flow": rng.uniform(70, 95),
+                    "balance": rng.uniform(65, 90),
+                    "smoothness": rng.uniform(75, 98),
+                    "energy": rng.uniform(60, 85)
                 }
             },
             "videoInfo": {
@@ -106,8 +130,14 @@ class DevelopmentServer:
         if not data_file.exists():
             print("No data.js found. Creating sample data for testing...")
             sample_data = self.generate_sample_data()
-            with open(data_file, 'w', encoding='utf-8') as f:
-                f.write(f"const flowStateData = {json.dumps(sample_data, indent=2)};")
+            if orjson is not None:
+                with open(data_file, 'wb') as f:
+                    f.write(b"const flowStateData = " + orjson.dumps(sample_data) + b";")
+            else:
+                with open(data_file, 'w', encoding='utf-8') as f:
+                    f.write("const flowStateData = ")
+                    json.dump(sample_data, f, separators=(",", ":"))
+                    f.write(";")
             print(f"Created sample data file: {data_file}")
 
     def start(self):
@@ -117,7 +147,7 @@ class DevelopmentServer:
         
         # Create the server
         handler = partial(FlowStateDevHandler, directory=str(self.directory))
-        self.server = socketserver.TCPServer(("", self.port), handler)
+        self.server = DevTCPServer(("", self.port), handler)
         
         # Start server in a separate thread
         self.server_thread = threading.Thread(target=self.server.serve_forever)
@@ -143,6 +173,7 @@ class DevelopmentServer:
             print("\nShutting down server...")
             self.server.shutdown()
             self.server_thread.join()
+            self.server.server_close()
             print("Server stopped.")
 
 
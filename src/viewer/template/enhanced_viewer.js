@@ -175,18 +175,26 @@ class FlowStateViewer {
 
     loadData() {
         if (typeof flowStateData !== 'undefined') {
-            this.poseLandmarks = flowStateData.poseData.pose_landmarks || [];
             this.videoInfo = flowStateData.videoInfo || {};
             this.scores = flowStateData.poseData.overall_scores || {};
             this.updateInfoPanel();
-            
-            // Update timeline
-            document.getElementById('total-frames').textContent = this.poseLandmarks.length;
-            
-            // Draw first frame
-            if (this.poseLandmarks.length > 0) {
-                this.drawPose(this.poseLandmarks[0]);
-            }
+
+            loadPoseLandmarks(flowStateData)
+                .then(frames => {
+                    this.poseLandmarks = frames.map(frame => frame.body || frame);
+
+                    // Update timeline
+                    document.getElementById('total-frames').textContent = this.poseLandmarks.length;
+
+                    // Draw first frame
+                    if (this.poseLandmarks.length > 0) {
+                        this.drawPose(this.poseLandmarks[0]);
+                    }
+                })
+                .catch(error => {
+                    console.error(error);
+                    alert("Pose landmarks could not be loaded.");
+                });
         } else {
             console.error("flowStateData not found!");
             alert("Analysis data could not be loaded.");
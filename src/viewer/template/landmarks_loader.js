@@ -0,0 +1,58 @@
+// FlowState landmarks loader
+// Decodes the float16 landmarks.bin asset written by the viewer builder
+
+function halfToFloat(h) {
+    const sign = (h & 0x8000) ? -1 : 1;
+    const exponent = (h >> 10) & 0x1f;
+    const fraction = h & 0x03ff;
+
+    if (exponent === 0) {
+        return sign * Math.pow(2, -14) * (fraction / 1024);
+    }
+    if (exponent === 0x1f) {
+        return fraction ? NaN : sign * Infinity;
+    }
+    return sign * Math.pow(2, exponent - 15) * (1 + fraction / 1024);
+}
+
+// Resolves to one entry per frame: {body, hand_left, hand_right, face},
+// each an array of {x, y, z, visibility} landmarks.
+function loadPoseLandmarks(data) {
+    const meta = data.landmarks;
+    if (!meta) {
+        return Promise.resolve(data.poseData.pose_landmarks || []);
+    }
+
+    return fetch(meta.url)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`Failed to load ${meta.url}: ${response.status}`);
+            }
+            return response.arrayBuffer();
+        })
+        .then(buffer => {
+            const values = new Uint16Array(buffer);
+            const [frameCount, keypointCount, channels] = meta.shape;
+            const frames = new Array(frameCount);
+
+            for (let f = 0; f < frameCount; f++) {
+                const frame = {};
+                for (const [name, [start, end]] of Object.entries(meta.groups)) {
+                    const landmarks = [];
+                    for (let k = start; k < end; k++) {
+                        const i = (f * keypointCount + k) * channels;
+                        landmarks.push({
+                            x: halfToFloat(values[i]),
+                            y: halfToFloat(values[i + 1]),
+                            z: 0,
+                            visibility: halfToFloat(values[i + 2])
+                        });
+                    }
+                    frame[name] = landmarks;
+                }
+                frames[f] = frame;
+            }
+
+            return frames;
+        });
+}
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for resolution-independent pose analysis.
+Analyzes the same clip at full size and downscaled, and checks the scores agree.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import torch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.config import settings
+from src.core.analyzer import OpenPoseDetector, PoseAnalyzer
+from src.core.downloader import YouTubeDownloader
+from src.cli.app import FlowStateCLI
+from test_input_video import create_test_video
+
+# Body keypoints around the test video's circle, in circle radii from its center
+FIGURE_OFFSETS = np.array([
+    [0, -3.0], [-0.3, -3.2], [0.3, -3.2], [-0.6, -3.0], [0.6, -3.0],  # nose, eyes, ears
+    [-1.0, -1.5], [1.0, -1.5], [-1.5, -0.5], [1.5, -0.5], [-1.8, 0.5], [1.8, 0.5],  # arms
+    [-0.7, 1.0], [0.7, 1.0], [-0.7, 2.5], [0.7, 2.5], [-0.7, 4.0], [0.7, 4.0],  # legs
+], dtype=np.float32)
+
+
+class _Keypoints:
+    def __init__(self, data: torch.Tensor):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+
+class _Result:
+    def __init__(self, keypoints: torch.Tensor):
+        self.keypoints = _Keypoints(keypoints)
+
+
+class CirclePoseModel:
+    """
+    Stand-in for the YOLO pose model that "detects" a figure around the green circle.
+    Keypoints are in the pixel space of the frame it is given, like the real model's.
+    """
+
+    def __call__(self, images, **kwargs):
+        results = []
+        for image in images:
+            # Green minus red isolates the circle from the white frame counter
+            weight = np.clip(image[..., 1].astype(np.float32) - image[..., 2], 0, None)
+            total = weight.sum()
+            ys, xs = np.indices(weight.shape)
+            center = np.array([(xs * weight).sum() / total, (ys * weight).sum() / total], dtype=np.float32)
+            radius = np.sqrt(total / (255 * np.pi))
+
+            xy = center + FIGURE_OFFSETS * radius
+            conf = np.full((len(xy), 1), 0.9, dtype=np.float32)
+            results.append(_Result(torch.from_numpy(np.concatenate([xy, conf], axis=1))[None]))
+        return results
+
+
+def analyze_at(video_path: Path, analysis_frame_size):
+    """Run the CLI's streaming analysis with the given analysis frame size."""
+    settings.analysis_frame_size = analysis_frame_size
+
+    # Only the downloader and analyzer are needed; skip setting up publishing
+    cli = FlowStateCLI.__new__(FlowStateCLI)
+    cli.downloader = YouTubeDownloader()
+    cli.analyzer = PoseAnalyzer()
+    try:
+        pose_data = cli.extract_and_analyze(video_path)
+        pose_frames = cli.analyzer.last_detections[0]
+    finally:
+        cli.analyzer.close()
+        cli.downloader.cleanup()
+
+    max_x = max(float(pose.body_xy[:, 0].max()) for pose in pose_frames if len(pose.body_xy))
+    return pose_data["overall_scores"], max_x
+
+
+def test_scores_independent_of_analysis_size():
+    """Test that downscaling for analysis does not change the scores."""
+    print("Testing analysis at 1280 and 640 pixels...")
+
+    original_size = settings.analysis_frame_size
+    original_load = OpenPoseDetector._load_pose_model
+    OpenPoseDetector._load_pose_model = lambda self, device: CirclePoseModel()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        video_path = Path(tmpdir) / "clip.mp4"
+        create_test_video(video_path, width=1280, height=720)
+
+        try:
+            full_scores, full_max_x = analyze_at(video_path, None)
+            scaled_scores, scaled_max_x = analyze_at(video_path, 640)
+        finally:
+            settings.analysis_frame_size = original_size
+            OpenPoseDetector._load_pose_model = original_load
+
+    # Keypoints must come back in source pixels, not in the 640-wide frame
+    assert abs(full_max_x - scaled_max_x) < 2.0, f"Keypoints not in source pixels: {full_max_x} vs {scaled_max_x}"
+    print(f"✓ Keypoints in source pixels (max x {full_max_x:.1f} vs {scaled_max_x:.1f})")
+
+    for name, full_score in full_scores.items():
+        scaled_score = scaled_scores[name]
+        assert abs(full_score - scaled_score) < 1.0, f"{name} score differs: {full_score:.2f} vs {scaled_score:.2f}"
+        print(f"✓ {name}: {full_score:.2f} (1280) vs {scaled_score:.2f} (640)")
+
+
+def main():
+    """Run all tests."""
+    print("FlowState Analysis Resolution Test Suite")
+    print("=" * 40)
+
+    tests = [
+        test_scores_independent_of_analysis_size
+    ]
+
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            print(f"✗ Test failed: {test.__name__}")
+            print(f"  Error: {e}")
+            import traceback
+            traceback.print_exc()
+            failed += 1
+
+    print("\n" + "=" * 40)
+    if failed == 0:
+        print("✓ All tests passed!")
+        return 0
+    else:
+        print(f"✗ {failed} test(s) failed")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
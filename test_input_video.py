@@ -5,35 +5,35 @@ Creates a test video and validates local video processing.
 """
 
 import sys
-import cv2
-import numpy as np
 from pathlib import Path
 import subprocess
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.core.downloader import YouTubeDownloader
 
-
-def create_test_video(output_path: Path, duration_seconds: int = 2):
+def create_test_video(output_path: Path, duration_seconds: int = 2, width: int = 640, height: int = 480):
     """Create a simple test video file."""
+    import cv2
+    import numpy as np
+
     fps = 30
-    width, height = 640, 480
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     
     out = cv2.VideoWriter(str(output_path), fourcc, fps, (width, height))
     
-    for frame_num in range(fps * duration_seconds):
+    num_frames = fps * duration_seconds
+    
+    # Circle path for every frame up front, and one frame buffer reused throughout
+    angles = np.arange(num_frames) * 0.1
+    xs = (width/2 + 100 * np.sin(angles)).astype(int).tolist()
+    ys = (height/2 + 100 * np.cos(angles)).astype(int).tolist()
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    
+    for frame_num in range(num_frames):
         # Create a frame with moving circle
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
-        
-        # Add some movement
-        x = int(width/2 + 100 * np.sin(frame_num * 0.1))
-        y = int(height/2 + 100 * np.cos(frame_num * 0.1))
-        
-        # Draw circle
-        cv2.circle(frame, (x, y), 30, (0, 255, 0), -1)
+        frame.fill(0)
+        cv2.circle(frame, (xs[frame_num], ys[frame_num]), 30, (0, 255, 0), -1)
         
         # Add frame number
         cv2.putText(frame, f"Frame {frame_num}", (10, 30), 
@@ -47,6 +47,8 @@ def create_test_video(output_path: Path, duration_seconds: int = 2):
 
 def test_local_video_processing():
     """Test processing of local video file."""
+    from src.core.downloader import YouTubeDownloader
+
     print("Testing local video processing...")
     
     # Create test video
@@ -4,15 +4,57 @@ Test script for FlowState viewer functionality.
 Generates test data and validates the viewer setup.
 """
 
+import http.client
+import functools
 import json
+import os
+import socket
 import sys
+import threading
 from pathlib import Path
-import subprocess
 import time
-import requests
-import webbrowser
-from typing import Dict, Any, List
-import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Keep-alive connections, one per thread and (host, port), reused across requests
+_connections = threading.local()
+
+
+def http_get(host: str, port: int, path: str, timeout: float = 5.0):
+    """GET path over a pooled keep-alive connection and return (response, body)."""
+    pool = _connections.__dict__.setdefault("pool", {})
+    conn = pool.get((host, port))
+    if conn is None:
+        conn = pool[(host, port)] = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response, response.read()
+    except (http.client.HTTPException, OSError):
+        # Drop the broken connection so the next call opens a fresh one
+        conn.close()
+        del pool[(host, port)]
+        raise
+
+
+def wait_for_port(port: int, timeout: float = 5.0, process: "subprocess.Popen" = None) -> bool:
+    """Poll until something accepts connections on localhost:port, or the process exits."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.1):
+                return True
+        except OSError:
+            if process is not None and process.poll() is not None:
+                return False
+            time.sleep(0.02)
+    return False
 
 
 class ViewerTester:
@@ -23,57 +65,92 @@ class ViewerTester:
         self.viewer_dir = self.root_dir / "viewer"
         self.template_dir = self.viewer_dir / "template"
         self.test_output_dir = self.root_dir / "test_output" / "viewer"
+    
+    @functools.cached_property
+    def _template_cache(self) -> Dict[str, bytes]:
+        """Template file contents, read once and reused by every setup."""
+        if not self.template_dir.is_dir():
+            return {}
+        # data.js is always replaced by generated data, so it is not cached
+        with os.scandir(self.template_dir) as entries:
+            return {
+                entry.name: Path(entry.path).read_bytes()
+                for entry in entries
+                if entry.is_file() and entry.name != "data.js"
+            }
+        
+    def generate_test_pose_data(self, num_frames: int = 120, seed: int = 0,
+                                landmarks_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Generate realistic test pose data, deterministic for a given seed.
+        With landmarks_path, landmarks are written there in the builder's float16
+        landmarks.bin layout and referenced from the data instead of inlined as JSON.
+        """
+        # Heavy imports are deferred so the file checks start quickly
+        import numpy as np
         
-    def generate_test_pose_data(self, num_frames: int = 120) -> Dict[str, Any]:
-        """Generate realistic test pose data."""
         print("Generating test pose data...")
         
+        rng = np.random.default_rng(seed)
+        
         # MediaPipe has 33 pose landmarks
         num_landmarks = 33
-        pose_landmarks = []
         
-        for frame in range(num_frames):
-            frame_landmarks = []
-            t = frame / num_frames * 2 * np.pi
-            
-            for landmark_id in range(num_landmarks):
-                # Create smooth, realistic movement patterns
-                base_x = 0.5 + 0.3 * np.sin(t + landmark_id * 0.1)
-                base_y = 0.5 + 0.2 * np.cos(t * 0.5 + landmark_id * 0.1)
-                base_z = 0.1 * np.sin(t * 2 + landmark_id * 0.05)
-                
-                # Add some noise for realism
-                noise_scale = 0.02
-                x = base_x + np.random.normal(0, noise_scale)
-                y = base_y + np.random.normal(0, noise_scale)
-                z = base_z + np.random.normal(0, noise_scale * 0.5)
-                
-                frame_landmarks.append({
-                    "x": float(x),
-                    "y": float(y),
-                    "z": float(z),
-                    "visibility": float(0.8 + 0.2 * np.random.random())
-                })
-            
-            pose_landmarks.append(frame_landmarks)
+        # Smooth, realistic movement patterns for all frames and landmarks at once
+        t = np.linspace(0, 2 * np.pi, num_frames, endpoint=False)[:, None]
+        landmark_ids = np.arange(num_landmarks)[None, :]
+        base = np.stack([
+            0.5 + 0.3 * np.sin(t + landmark_ids * 0.1),
+            0.5 + 0.2 * np.cos(t * 0.5 + landmark_ids * 0.1),
+            0.1 * np.sin(t * 2 + landmark_ids * 0.05),
+        ], axis=-1)
+        
+        # Add some noise for realism
+        noise_scale = 0.02
+        coords = base + rng.standard_normal(base.shape) * [noise_scale, noise_scale, noise_scale * 0.5]
+        visibility = 0.8 + 0.2 * rng.random((num_frames, num_landmarks, 1))
+        
+        landmarks_meta = None
+        if landmarks_path is not None:
+            # (frames, keypoints, [x, y, confidence]); the viewer loader fills in z = 0
+            landmarks = np.concatenate([coords[..., :2], visibility], axis=-1)
+            landmarks_path.write_bytes(landmarks.astype("<f2").tobytes())
+            landmarks_meta = {
+                "url": landmarks_path.name,
+                "shape": list(landmarks.shape),
+                "dtype": "float16",
+                "fps": 30,
+                "channels": ["x", "y", "confidence"],
+                "groups": {"body": [0, num_landmarks]}
+            }
+            pose_landmarks = []
+        else:
+            # One bulk conversion to Python floats, then plain dict construction
+            landmarks = np.concatenate([coords, visibility], axis=-1).tolist()
+            pose_landmarks = [
+                [{"x": x, "y": y, "z": z, "visibility": v} for x, y, z, v in frame]
+                for frame in landmarks
+            ]
         
         # Generate scores
         scores = {
-            "flow": float(75 + 20 * np.random.random()),
-            "balance": float(70 + 25 * np.random.random()),
-            "smoothness": float(80 + 15 * np.random.random()),
-            "energy": float(65 + 30 * np.random.random())
+            "flow": float(75 + 20 * rng.random()),
+            "balance": float(70 + 25 * rng.random()),
+            "smoothness": float(80 + 15 * rng.random()),
+            "energy": float(65 + 30 * rng.random())
         }
+        frame_score_noise = rng.normal(0, 5, (2, num_frames))
         
         return {
             "poseData": {
                 "pose_landmarks": pose_landmarks,
                 "overall_scores": scores,
                 "frame_scores": {
-                    "flow": [float(scores["flow"] + np.random.normal(0, 5)) for _ in range(num_frames)],
-                    "balance": [float(scores["balance"] + np.random.normal(0, 5)) for _ in range(num_frames)]
+                    "flow": (scores["flow"] + frame_score_noise[0]).tolist(),
+                    "balance": (scores["balance"] + frame_score_noise[1]).tolist()
                 }
             },
+            "landmarks": landmarks_meta,
             "videoInfo": {
                 "title": "Test Dance Performance",
                 "uploader": "FlowState Tester",
@@ -97,19 +174,26 @@ class ViewerTester:
         # Create output directory
         self.test_output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Copy template files
-        for template_file in self.template_dir.glob("*"):
-            if template_file.is_file():
-                dest_file = self.test_output_dir / template_file.name
-                dest_file.write_bytes(template_file.read_bytes())
-                print(f"  Copied {template_file.name}")
+        # Copy template files from the in-memory cache, replacing each one atomically
+        for name, content in self._template_cache.items():
+            tmp_path = self.test_output_dir / f".{name}.tmp"
+            tmp_path.write_bytes(content)
+            tmp_path.replace(self.test_output_dir / name)
+            print(f"  Copied {name}")
         
-        # Generate test data
-        test_data = self.generate_test_pose_data()
+        # Generate test data, with landmarks as a binary asset like the builder ships them
+        test_data = self.generate_test_pose_data(landmarks_path=self.test_output_dir / "landmarks.bin")
         data_js_path = self.test_output_dir / "data.js"
         
-        with open(data_js_path, 'w', encoding='utf-8') as f:
-            f.write(f"const flowStateData = {json.dumps(test_data, indent=2)};")
+        if orjson is not None:
+            payload = orjson.dumps(test_data)
+            data_js_path.write_bytes(b"const flowStateData = " + payload + b";")
+        else:
+            # Stream the JSON into the file rather than building it as one string first
+            with open(data_js_path, 'w', encoding='utf-8') as f:
+                f.write("const flowStateData = ")
+                json.dump(test_data, f, separators=(',', ':'), ensure_ascii=False)
+                f.write(";")
         
         print(f"  Generated test data: {data_js_path}")
         return self.test_output_dir
@@ -126,9 +210,18 @@ class ViewerTester:
             self.template_dir / "enhanced_viewer.js"
         ]
         
+        # One directory listing per parent instead of a stat() per file
+        listings: Dict[Path, set] = {}
+        for directory in {file_path.parent for file_path in required_files}:
+            try:
+                with os.scandir(directory) as entries:
+                    listings[directory] = {entry.name for entry in entries if entry.is_file()}
+            except OSError:
+                listings[directory] = set()
+        
         all_exist = True
         for file_path in required_files:
-            if file_path.exists():
+            if file_path.name in listings[file_path.parent]:
                 print(f"  ✓ {file_path.relative_to(self.root_dir)}")
             else:
                 print(f"  ✗ {file_path.relative_to(self.root_dir)} - MISSING")
@@ -138,6 +231,8 @@ class ViewerTester:
     
     def test_dev_server(self, port: int = 8081) -> bool:
         """Test the development server."""
+        import subprocess
+        
         print(f"\nTesting development server on port {port}...")
         
         # Start the server
@@ -150,21 +245,31 @@ class ViewerTester:
         ]
         
         try:
-            # Start server process
+            # Start server process; without close_fds CPython can use posix_spawn
+            # instead of fork+exec (our own fds are non-inheritable anyway)
             process = subprocess.Popen(
                 server_cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                close_fds=False
             )
             
-            # Give server time to start
-            time.sleep(2)
-            
+            # Wait until the server accepts connections
+            if not wait_for_port(port, process=process):
+                if process.poll() is not None:
+                    print(f"  ✗ Server exited with code {process.returncode} before listening on port {port}")
+                    stderr = process.stderr.read().strip()
+                    if stderr:
+                        print(f"    {stderr}")
+                else:
+                    print(f"  ✗ Server did not start listening on port {port}")
+                return False
+
             # Test server is responding
             try:
-                response = requests.get(f"http://localhost:{port}/", timeout=5)
-                if response.status_code == 200:
+                response, _ = http_get("localhost", port, "/")
+                if response.status == 200:
                     print(f"  ✓ Server responding on http://localhost:{port}")
                     
                     # Test specific files
@@ -172,34 +277,45 @@ class ViewerTester:
                         "/index.html",
                         "/enhanced_viewer.html",
                         "/enhanced_viewer.js",
-                        "/data.js"
+                        "/data.js",
+                        "/landmarks.bin"
                     ]
                     
-                    for url in test_urls:
-                        response = requests.get(f"http://localhost:{port}{url}", timeout=5)
-                        if response.status_code == 200:
+                    # The requests are independent, so issue them concurrently
+                    with ThreadPoolExecutor(max_workers=len(test_urls)) as executor:
+                        responses = list(executor.map(
+                            lambda url: http_get("localhost", port, url)[0],
+                            test_urls
+                        ))
+
+                    for url, response in zip(test_urls, responses):
+                        if response.status == 200:
                             print(f"  ✓ {url} - OK")
                         else:
-                            print(f"  ✗ {url} - Status {response.status_code}")
+                            print(f"  ✗ {url} - Status {response.status}")
                     
                     return True
                 else:
-                    print(f"  ✗ Server returned status {response.status_code}")
+                    print(f"  ✗ Server returned status {response.status}")
                     return False
                     
-            except requests.exceptions.RequestException as e:
+            except (http.client.HTTPException, OSError) as e:
                 print(f"  ✗ Failed to connect to server: {e}")
                 return False
                 
         finally:
             # Clean up server process
             process.terminate()
-            time.sleep(1)
-            if process.poll() is None:
+            try:
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
                 process.kill()
     
     def test_docker_build(self) -> bool:
         """Test Docker build process."""
+        import subprocess
+        import tempfile
+        
         print("\nTesting Docker build...")
         
         try:
@@ -218,20 +334,25 @@ class ViewerTester:
             
             # Try building the image
             print("  Building Docker image (this may take a while)...")
-            result = subprocess.run(
-                ["docker", "build", "-t", "flowstate-test:latest", "."],
-                cwd=self.root_dir,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                print("  ✓ Docker image built successfully")
-                return True
-            else:
-                print(f"  ✗ Docker build failed:")
-                print(result.stderr)
-                return False
+            # Build output is only shown on failure: stdout is discarded and stderr
+            # goes to a temporary file, so no pipe has to be drained while it runs
+            with tempfile.TemporaryFile() as stderr_file:
+                result = subprocess.run(
+                    ["docker", "build", "-t", "flowstate-test:latest", "."],
+                    cwd=self.root_dir,
+                    stdout=subprocess.DEVNULL,
+                    stderr=stderr_file,
+                    close_fds=False
+                )
+                
+                if result.returncode == 0:
+                    print("  ✓ Docker image built successfully")
+                    return True
+                else:
+                    print(f"  ✗ Docker build failed:")
+                    stderr_file.seek(0)
+                    print(stderr_file.read().decode(errors="replace"))
+                    return False
                 
         except FileNotFoundError:
             print("  ✗ Docker not installed")
@@ -279,6 +400,7 @@ class ViewerTester:
             if "--no-browser" not in sys.argv:
                 response = input("\nOpen test viewer in browser? (y/n): ")
                 if response.lower() == 'y':
+                    import webbrowser
                     viewer_path = self.test_output_dir / "enhanced_viewer.html"
                     webbrowser.open(f"file://{viewer_path}")
         else:
@@ -4,13 +4,16 @@ Test script for FlowState web server functionality.
 Validates that the fallback web server works correctly.
 """
 
+import http.client
+import io
+import socket
 import sys
+import threading
 import time
 import tempfile
 import json
 from pathlib import Path
 import subprocess
-import requests
 from concurrent.futures import ThreadPoolExecutor
 
 # Add src to path for imports
@@ -19,13 +22,58 @@ sys.path.insert(0, str(Path(__file__).parent))
 from src.core.server import FlowStateServer
 
 
-def create_test_viewer(output_dir: Path) -> Path:
-    """Create a test viewer directory with sample files."""
-    viewer_dir = output_dir / "viewer"
-    viewer_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Create index.html
-    html_content = """<!DOCTYPE html>
+# Keep-alive connections, one per thread and (host, port), reused across requests
+_connections = threading.local()
+
+
+def http_get(host: str, port: int, path: str, timeout: float = 5.0):
+    """GET path over a pooled keep-alive connection and return (response, body)."""
+    pool = _connections.__dict__.setdefault("pool", {})
+    conn = pool.get((host, port))
+    if conn is None:
+        conn = pool[(host, port)] = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return response, response.read()
+    except (http.client.HTTPException, OSError):
+        # Drop the broken connection so the next call opens a fresh one
+        conn.close()
+        del pool[(host, port)]
+        raise
+
+
+# Per-thread output buffers for the server tests, which run concurrently
+_thread_output = threading.local()
+
+
+class _ThreadOutput:
+    """Stand-in for sys.stdout that sends a thread's writes to its buffer, if it has one."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text: str) -> int:
+        return getattr(_thread_output, "buffer", self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def wait_for_port(port: int, timeout: float = 5.0) -> bool:
+    """Poll until something accepts connections on localhost:port."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.02)
+    return False
+
+
+# Test viewer files, encoded once and shared by every server test
+_INDEX_HTML = """<!DOCTYPE html>
 <html>
 <head>
     <title>FlowState Test Viewer</title>
@@ -35,28 +83,37 @@ def create_test_viewer(output_dir: Path) -> Path:
     <div id="container"></div>
     <script src="data.js"></script>
 </body>
-</html>"""
-    (viewer_dir / "index.html").write_text(html_content)
-    
-    # Create data.js with sample data
-    data = {
-        "poseData": {
-            "pose_landmarks": [[{"x": 0, "y": 0, "z": 0, "visibility": 1.0}]],
-            "overall_scores": {
-                "flow": 85.5,
-                "balance": 78.2,
-                "smoothness": 92.1,
-                "energy": 71.3
-            }
-        },
-        "videoInfo": {
-            "title": "Test Video",
-            "uploader": "Test User",
-            "uploadDate": "2024-01-01",
-            "webpageUrl": "#"
+</html>""".encode("utf-8")
+
+_TEST_DATA = {
+    "poseData": {
+        "pose_landmarks": [[{"x": 0, "y": 0, "z": 0, "visibility": 1.0}]],
+        "overall_scores": {
+            "flow": 85.5,
+            "balance": 78.2,
+            "smoothness": 92.1,
+            "energy": 71.3
         }
+    },
+    "videoInfo": {
+        "title": "Test Video",
+        "uploader": "Test User",
+        "uploadDate": "2024-01-01",
+        "webpageUrl": "#"
     }
-    (viewer_dir / "data.js").write_text(f"const flowStateData = {json.dumps(data, indent=2)};")
+}
+_DATA_JS = (
+    f"const flowStateData = {json.dumps(_TEST_DATA, separators=(',', ':'), ensure_ascii=False)};"
+).encode("utf-8")
+
+
+def create_test_viewer(output_dir: Path) -> Path:
+    """Create a test viewer directory with sample files."""
+    viewer_dir = output_dir / "viewer"
+    viewer_dir.mkdir(parents=True, exist_ok=True)
+    
+    (viewer_dir / "index.html").write_bytes(_INDEX_HTML)
+    (viewer_dir / "data.js").write_bytes(_DATA_JS)
     
     return viewer_dir
 
@@ -72,14 +129,12 @@ def test_server_startup():
         assert server.validate_directory(), "Directory validation failed"
         assert server.start(daemon=True), "Server failed to start"
         
-        # Give server time to start
-        time.sleep(1)
-        
         # Test that server is accessible
         try:
-            response = requests.get("http://localhost:8888/index.html", timeout=5)
-            assert response.status_code == 200, f"Unexpected status code: {response.status_code}"
-            assert "FlowState Test Viewer" in response.text, "Expected content not found"
+            assert wait_for_port(8888), "Server did not start listening on port 8888"
+            response, body = http_get("localhost", 8888, "/index.html")
+            assert response.status == 200, f"Unexpected status code: {response.status}"
+            assert b"FlowState Test Viewer" in body, "Expected content not found"
             print("✓ Server started successfully and is accessible")
         finally:
             server.stop()
@@ -94,17 +149,16 @@ def test_host_network_binding():
         server = FlowStateServer(port=8889, directory=viewer_dir, host='0.0.0.0')
         
         if server.start(daemon=True):
-            time.sleep(1)
-            
             # Test localhost access
             try:
-                response = requests.get("http://localhost:8889/", timeout=5)
-                assert response.status_code == 200, "Localhost access failed"
+                assert wait_for_port(8889), "Server did not start listening on port 8889"
+                response, _ = http_get("localhost", 8889, "/")
+                assert response.status == 200, "Localhost access failed"
                 print("✓ Server accessible on localhost")
                 
                 # Test 0.0.0.0 binding (would be accessible from network)
-                response = requests.get("http://127.0.0.1:8889/", timeout=5)
-                assert response.status_code == 200, "127.0.0.1 access failed"
+                response, _ = http_get("127.0.0.1", 8889, "/")
+                assert response.status == 200, "127.0.0.1 access failed"
                 print("✓ Server accessible on all interfaces")
             finally:
                 server.stop()
@@ -119,10 +173,9 @@ def test_cors_headers():
         server = FlowStateServer(port=8890, directory=viewer_dir)
         
         if server.start(daemon=True):
-            time.sleep(1)
-            
             try:
-                response = requests.get("http://localhost:8890/data.js", timeout=5)
+                assert wait_for_port(8890), "Server did not start listening on port 8890"
+                response, _ = http_get("localhost", 8890, "/data.js")
                 assert 'Access-Control-Allow-Origin' in response.headers, "CORS header missing"
                 assert response.headers['Access-Control-Allow-Origin'] == '*', "CORS header incorrect"
                 print("✓ CORS headers correctly configured")
@@ -139,13 +192,12 @@ def test_concurrent_requests():
         server = FlowStateServer(port=8891, directory=viewer_dir)
         
         if server.start(daemon=True):
-            time.sleep(1)
-            
             def make_request(i):
-                response = requests.get(f"http://localhost:8891/index.html?test={i}", timeout=5)
-                return response.status_code == 200
+                response, _ = http_get("localhost", 8891, f"/index.html?test={i}")
+                return response.status == 200
             
             try:
+                assert wait_for_port(8891), "Server did not start listening on port 8891"
                 with ThreadPoolExecutor(max_workers=10) as executor:
                     futures = [executor.submit(make_request, i) for i in range(20)]
                     results = [f.result() for f in futures]
@@ -162,9 +214,9 @@ def test_docker_entrypoint():
     
     entrypoint_path = Path(__file__).parent / "docker-entrypoint.sh"
     if entrypoint_path.exists():
-        content = entrypoint_path.read_text()
-        assert '"server"|"serve")' in content, "Server command not found in entrypoint"
-        assert 'python -m src.core.server' in content, "Server module call not found"
+        content = entrypoint_path.read_bytes()
+        assert b'"server"|"serve")' in content, "Server command not found in entrypoint"
+        assert b'python -m src.core.server' in content, "Server module call not found"
         print("✓ Docker entrypoint correctly configured")
     else:
         print("⚠ Docker entrypoint not found, skipping test")
@@ -176,10 +228,10 @@ def test_cli_integration():
     
     cli_path = Path(__file__).parent / "src" / "cli" / "app.py"
     if cli_path.exists():
-        content = cli_path.read_text()
-        assert '--serve' in content, "Serve option not found in CLI"
-        assert 'FlowStateServer' in content, "FlowStateServer import not found"
-        assert 'serve_port' in content, "Serve port option not found"
+        content = cli_path.read_bytes()
+        assert b'--serve' in content, "Serve option not found in CLI"
+        assert b'FlowStateServer' in content, "FlowStateServer import not found"
+        assert b'serve_port' in content, "Serve port option not found"
         print("✓ CLI integration correctly configured")
     else:
         print("⚠ CLI app not found, skipping test")
@@ -190,23 +242,48 @@ def main():
     print("FlowState Web Server Test Suite")
     print("=" * 40)
     
-    tests = [
+    # Each server test binds its own port, so they can run side by side
+    server_tests = [
         test_server_startup,
         test_host_network_binding,
         test_cors_headers,
-        test_concurrent_requests,
+        test_concurrent_requests
+    ]
+    static_tests = [
         test_docker_entrypoint,
         test_cli_integration
     ]
     
-    failed = 0
-    for test in tests:
+    def run_test(test) -> bool:
         try:
             test()
+            return True
         except Exception as e:
             print(f"✗ Test failed: {test.__name__}")
             print(f"  Error: {e}")
-            failed += 1
+            return False
+    
+    def run_buffered(test):
+        # Capture this thread's output so each test's report stays together
+        buffer = _thread_output.buffer = io.StringIO()
+        try:
+            return run_test(test), buffer.getvalue()
+        finally:
+            del _thread_output.buffer
+    
+    sys.stdout = _ThreadOutput(sys.stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=len(server_tests)) as executor:
+            reports = list(executor.map(run_buffered, server_tests))
+    finally:
+        sys.stdout = sys.stdout.stream
+    
+    results = []
+    for passed, output in reports:
+        print(output, end="")
+        results.append(passed)
+    results.extend(run_test(test) for test in static_tests)
+    failed = results.count(False)
     
     print("\n" + "=" * 40)
     if failed == 0: